@@ -0,0 +1,148 @@
+class BDD:
+    """Manager for reduced ordered binary decision diagrams (ROBDDs).
+    
+    Nodes are integers indexing parallel tables of variable, low child and
+    high child. Node 0 is the FALSE terminal and node 1 the TRUE terminal.
+    Every node is unique for its (variable, low, high) triple, so two
+    functions built with the same manager are equivalent if and only if they
+    are the same node.
+    """
+    
+    FALSE = 0
+    TRUE = 1
+    
+    # Boolean operations on the terminals. Unary operations ignore b.
+    OPS = {
+        'AND': lambda a, b: a & b,
+        'NAND': lambda a, b: 1 - (a & b),
+        'OR': lambda a, b: a | b,
+        'NOR': lambda a, b: 1 - (a | b),
+        'XOR': lambda a, b: a ^ b,
+        'NOT': lambda a, b: 1 - a,
+    }
+    
+    def __init__(self, n_vars):
+        """
+        Parameters
+        ----------
+        n_vars : int
+            Number of variables, ordered 0 to n_vars - 1 from the root down.
+        """
+        
+        self.n_vars = n_vars
+        # Terminals sit below every variable
+        self._var = [n_vars, n_vars]
+        self._low = [None, None]
+        self._high = [None, None]
+        self._unique = {}
+        self._cache = {}
+    
+    def __len__(self):
+        """Return the number of nodes, including the terminals."""
+        return len(self._var)
+    
+    def mk(self, var, low, high):
+        """Return the node for 'if var then high else low'."""
+        
+        # Redundant test
+        if low == high:
+            return low
+        
+        key = (var, low, high)
+        if key not in self._unique:
+            self._var.append(var)
+            self._low.append(low)
+            self._high.append(high)
+            self._unique[key] = len(self._var) - 1
+        
+        return self._unique[key]
+    
+    def var(self, i):
+        """Return the node of the ith variable."""
+        return self.mk(i, self.FALSE, self.TRUE)
+    
+    def apply(self, op, u, v=None):
+        """Return the node of op(u, v), op being a key of BDD.OPS."""
+        
+        if v is None:
+            v = u
+        if u <= 1 and v <= 1:
+            return self.OPS[op](u, v)
+        
+        key = (op, u, v)
+        if key in self._cache:
+            return self._cache[key]
+        
+        # Expand both operands on the topmost variable
+        top = min(self._var[u], self._var[v])
+        u0, u1 = (self._low[u], self._high[u]) if self._var[u] == top else (u, u)
+        v0, v1 = (self._low[v], self._high[v]) if self._var[v] == top else (v, v)
+        
+        # Recursion depth is bounded by the number of variables
+        result = self.mk(top, self.apply(op, u0, v0), self.apply(op, u1, v1))
+        self._cache[key] = result
+        
+        return result
+    
+    def evaluate(self, u, bits):
+        """Return the value of the function for bits[i] assigned to variable i."""
+        
+        while u > 1:
+            u = self._high[u] if bits[self._var[u]] else self._low[u]
+        
+        return u
+    
+    def size(self, u):
+        """Return the number of nodes reachable from u, including terminals."""
+        
+        seen = set()
+        stack = [u]
+        while stack:
+            node = stack.pop()
+            if node not in seen:
+                seen.add(node)
+                if node > 1:
+                    stack.extend([self._low[node], self._high[node]])
+        
+        return len(seen)
+    
+    def sat_count(self, u):
+        """Return the number of assignments of all variables satisfying u."""
+        
+        counts = {self.FALSE: 0, self.TRUE: 1}
+        
+        # Children before parents, without recursion
+        stack = [u]
+        while stack:
+            node = stack[-1]
+            if node in counts:
+                stack.pop()
+                continue
+            low, high = self._low[node], self._high[node]
+            if low in counts and high in counts:
+                # Variables skipped between a node and its child are free
+                counts[node] = (counts[low] * 2 ** (self._var[low] - self._var[node] - 1)
+                                + counts[high] * 2 ** (self._var[high] - self._var[node] - 1))
+                stack.pop()
+            else:
+                stack.extend(c for c in (low, high) if c not in counts)
+        
+        return counts[u] * 2 ** self._var[u] if u > 1 else counts[u] * 2 ** self.n_vars
+    
+    def satisfy_one(self, u):
+        """Return a satisfying assignment as a dict {variable: bit}, or None."""
+        
+        if u == self.FALSE:
+            return None
+        
+        assignment = {}
+        while u > 1:
+            # Every non-terminal node has a path to TRUE
+            if self._high[u] != self.FALSE:
+                assignment[self._var[u]] = 1
+                u = self._high[u]
+            else:
+                assignment[self._var[u]] = 0
+                u = self._low[u]
+        
+        return assignment
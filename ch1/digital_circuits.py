@@ -1,26 +1,149 @@
+import heapq
+from collections import namedtuple
 from itertools import product
 
+import numpy as np
+
+from bdd import BDD
+
+
+# Bitwise implementations of the primitive gates. `mask` has a 1 in every
+# bit position in use, so NOT-style gates flip only those bits.
+OPS = {
+    'AND': lambda a, b, mask: a & b,
+    'NAND': lambda a, b, mask: (a & b) ^ mask,
+    'OR': lambda a, b, mask: a | b,
+    'NOR': lambda a, b, mask: (a | b) ^ mask,
+    'XOR': lambda a, b, mask: a ^ b,
+    'NOT': lambda a, b, mask: a ^ mask,
+}
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses'])
+
 
 class LogicGate:
     """Simulation of logic gate."""
     
+    # Name of the primitive operation in OPS, None for composite gates
+    opcode = None
+    # Names of the input pin attributes
+    pin_names = ()
+    # Number of bits carried by multi-bit input pins, None for 1-bit pins
+    width = None
+    # Whether get_output() may reuse the last output until an input changes
+    cache = True
+    # Bits in use by pin values: 1 for single 0/1 values, or (1 << n) - 1 to
+    # evaluate n rows packed into ints with one bitwise operation per gate.
+    # Set it on LogicGate to switch every gate at once
+    mask = 1
+    
+    # Cache statistics shared by all gates
+    cache_hits = 0
+    cache_misses = 0
+    
     def __init__(self, label):
         self.label = label
         self.output = None
+        # Connectors leaving this gate, registered by Connector
+        self.fanout = []
+        # Whether .output is up to date with the inputs
+        self._valid = False
+        # Mask .output was computed with, as LogicGate.mask can change
+        self._output_mask = None
+    
+    def __setattr__(self, name, value):
+        """Invalidate cached outputs when an input pin is assigned a new source
+        or the gate is given its own mask.
+        """
+        
+        if name in self.pin_names or name == 'mask':
+            old = self.__dict__.get(name)
+            changed = old is not value
+            if changed and isinstance(old, int) and isinstance(value, int):
+                changed = old != value
+            super().__setattr__(name, value)
+            if changed:
+                self.invalidate()
+        else:
+            super().__setattr__(name, value)
+    
+    @classmethod
+    def cache_info(cls):
+        """Return the number of cached and computed get_output() calls."""
+        return CacheInfo(LogicGate.cache_hits, LogicGate.cache_misses)
+    
+    @classmethod
+    def reset_cache_info(cls):
+        LogicGate.cache_hits = 0
+        LogicGate.cache_misses = 0
+    
+    def invalidate(self):
+        """Mark the output of this gate and of every gate downstream as stale."""
+        
+        stack = [self]
+        while stack:
+            gate = stack.pop()
+            # Gates downstream of a stale gate are already stale
+            if gate._valid:
+                gate._valid = False
+                stack.extend(gate.get_fanout())
+    
+    def _cached(self):
+        """Check that .output is up to date with the inputs and the mask."""
+        return self._valid and self._output_mask == self.mask
+    
+    def _inputs_cached(self):
+        """Check that every input is set and every source gate's output is cached."""
+        
+        for name in self.pin_names:
+            pin = getattr(self, name)
+            if pin is None:
+                return False
+            if isinstance(pin, Connector) and not pin.get_from()._cached():
+                return False
+        
+        return True
     
     def get_label(self):
         """Identify gate."""
         return self.label
     
+    def get_fanout(self):
+        """Return gates connected to the output of this gate."""
+        return [c.get_to() for c in self.fanout]
+    
     def get_output(self):
-        """Call method implemented in subclasses to produce output."""
+        """Call method implemented in subclasses to produce output, unless
+        the output is cached and no input has changed since.
+        """
+        
+        if self._cached():
+            LogicGate.cache_hits += 1
+            return self.output
+        
+        LogicGate.cache_misses += 1
         self.output = self.perform_gate_logic()
+        self._output_mask = self.mask
+        # Outputs depending on prompted input are never cached
+        self._valid = self.cache and self._inputs_cached()
         return self.output
+    
+    def _expand(self, circuit, pins):
+        """Emit the gate's logic into a Circuit and return its output slot(s).
+        
+        Composite gates override this to emit their sub-gates.
+        """
+        if self.opcode is None:
+            raise TypeError('Gate {} cannot be compiled'.format(self.get_label()))
+        return circuit.emit(self.opcode, *pins, label=self.get_label())
 
 
 class BinaryGate(LogicGate):
     """Logic gate with two input lines."""
     
+    pin_names = ('pinA', 'pinB')
+    
     def __init__(self, label):
         
         # Call constructor of parent class
@@ -87,6 +210,8 @@ class BinaryGate(LogicGate):
 class TernaryGate(BinaryGate):
     """Logic gate with two input lines and an additional CIN input."""
     
+    pin_names = ('pinA', 'pinB', 'C_in')
+    
     def __init__(self, label):
         super().__init__(label)
         self.C_in = None
@@ -117,6 +242,8 @@ class TernaryGate(BinaryGate):
 class UnaryGate(LogicGate):
     """Logic gate with one input line."""
     
+    pin_names = ('pin',)
+    
     def __init__(self, label):
         super().__init__(label)
         self.pin = None
@@ -138,84 +265,97 @@ class UnaryGate(LogicGate):
 
 class AndGate(BinaryGate):
     
+    opcode = 'AND'
+    
     def __init__(self, label):
         super().__init__(label)
     
     def perform_gate_logic(self):
-        a = self.get_pinA()
-        b = self.get_pinB()
-        if a==1 and b==1:
-            return 1
-        else:
-            return 0
+        return OPS[self.opcode](self.get_pinA(), self.get_pinB(), self.mask)
 
 
 class NandGate(BinaryGate):
     
+    opcode = 'NAND'
+    
     def __init__(self, label):
         super().__init__(label)
     
     def perform_gate_logic(self):
-        a = self.get_pinA()
-        b = self.get_pinB()
-        if a==1 and b==1:
-            return 0
-        else:
-            return 1
+        return OPS[self.opcode](self.get_pinA(), self.get_pinB(), self.mask)
 
 
 class OrGate(BinaryGate):
     
+    opcode = 'OR'
+    
     def __init__(self, label):
         super().__init__(label)
     
     def perform_gate_logic(self):
-        a = self.get_pinA()
-        b = self.get_pinB()
-        if a==1 or b==1:
-            return 1
-        else:
-            return 0
+        return OPS[self.opcode](self.get_pinA(), self.get_pinB(), self.mask)
 
 
 class NorGate(BinaryGate):
     
+    opcode = 'NOR'
+    
     def __init__(self, label):
         super().__init__(label)
     
     def perform_gate_logic(self):
-        a = self.get_pinA()
-        b = self.get_pinB()
-        if a==1 or b==1:
-            return 0
-        else:
-            return 1
+        return OPS[self.opcode](self.get_pinA(), self.get_pinB(), self.mask)
 
 
 class XorGate(BinaryGate):
     
+    opcode = 'XOR'
+    
     def __init__(self, label):
         super().__init__(label)
     
     def perform_gate_logic(self):
-        a = self.get_pinA()
-        b = self.get_pinB()
-        if a == b:
-            return 0
-        else:
-            return 1      
+        return OPS[self.opcode](self.get_pinA(), self.get_pinB(), self.mask)
 
 
 class NotGate(UnaryGate):
     
+    opcode = 'NOT'
+    
     def __init__(self, label):
         super().__init__(label)
     
     def perform_gate_logic(self):
-        if self.get_pin():
-            return 0
+        return OPS[self.opcode](self.get_pin(), None, self.mask)
+
+
+class InputPin(LogicGate):
+    """Named circuit input that can drive any number of gate pins."""
+    
+    def __init__(self, label, value=None):
+        super().__init__(label)
+        self._value = value
+    
+    @property
+    def value(self):
+        return self._value
+    
+    @value.setter
+    def value(self, value):
+        self._value = value
+        self.invalidate()
+    
+    def _inputs_cached(self):
+        return self.value is not None
+    
+    def perform_gate_logic(self):
+        if self.value is None:
+            return int(input('Enter value for input {}: '.format(self.get_label())))
         else:
-            return 1
+            return self.value
+    
+    def _expand(self, circuit, pins):
+        return circuit.add_input(self.get_label())
 
 
 class Connector:
@@ -236,6 +376,8 @@ class Connector:
         self.togate = tgate
         self.cout = cout
         
+        fgate.fanout.append(self)
+        
         if cin:
             tgate.set_C_in(self)
         else:
@@ -266,6 +408,9 @@ class HalfAdder(BinaryGate):
         SUM = self.XOR.get_output()
         C_out = self.AND.get_output()
         return SUM, C_out
+    
+    def _expand(self, circuit, pins):
+        return self.XOR._expand(circuit, pins), self.AND._expand(circuit, pins)
 
 
 class FullAdder(TernaryGate):
@@ -291,55 +436,715 @@ class FullAdder(TernaryGate):
         SUM = self.HA2.get_output()[0]
         C_out = self.OR.get_output()
         return SUM, C_out
+    
+    def _expand(self, circuit, pins):
+        A, B, C_in = pins
+        sum1, carry1 = self.HA1._expand(circuit, [A, B])
+        SUM, carry2 = self.HA2._expand(circuit, [sum1, C_in])
+        C_out = self.OR._expand(circuit, [carry1, carry2])
+        return SUM, C_out
 
 
-class EightBitFullAdder(TernaryGate):
-    """Implementation of 8-bit full adder."""
+class Adder(TernaryGate):
+    """Base class for n-bit adders.
     
-    def __init__(self, label):
+    Pins A and B carry n-bit integers and CIN a single bit. The output is the
+    n-bit sum and the carry out. Subclasses emit their gates in _expand().
+    """
+    
+    def __init__(self, n_bits, label):
         super().__init__(label)
-        # Use half adder for the first adder
-        self.HA1 = HalfAdder('HA1')
-        self.FA2 = FullAdder('FA2')
-        self.FA3 = FullAdder('FA3')
-        self.FA4 = FullAdder('FA4')
-        self.FA5 = FullAdder('FA5')
-        self.FA6 = FullAdder('FA6')
-        self.FA7 = FullAdder('FA7')
-        self.FA8 = FullAdder('FA8')
-        c12 = Connector(self.HA1, self.FA2, cout=True, cin=True)
-        c23 = Connector(self.FA2, self.FA3, cout=True, cin=True)
-        c34 = Connector(self.FA3, self.FA4, cout=True, cin=True)
-        c45 = Connector(self.FA4, self.FA5, cout=True, cin=True)
-        c56 = Connector(self.FA5, self.FA6, cout=True, cin=True)
-        c67 = Connector(self.FA6, self.FA7, cout=True, cin=True)
-        c78 = Connector(self.FA7, self.FA8, cout=True, cin=True)
+        self.width = n_bits
+        self._circuit = None
+    
+    def perform_gate_logic(self):
+        return self.add(self.get_pinA(), self.get_pinB(), self.get_C_in())
+    
+    def circuit(self):
+        """Return the adder compiled to a Circuit with inputs A, B and CIN."""
+        
+        if self._circuit is None:
+            circuit = Circuit([])
+            pins = [circuit.add_input('A', self.width),
+                    circuit.add_input('B', self.width),
+                    circuit.add_input('C_in')]
+            circuit.outputs.append(self._expand(circuit, pins))
+            self._circuit = circuit
+        
+        return self._circuit
+    
+    def depth(self):
+        """Return the number of gates on the longest path through the adder."""
+        return self.circuit().depth()
+    
+    def add(self, a, b, c_in=0):
+        """Return the n-bit sum a + b + c_in and the carry out.
+        
+        Operands are ints or NumPy integer arrays; arrays are added elementwise.
+        """
+        
+        if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+            return self._add_arrays(a, b, c_in)
+        
+        return self.circuit().evaluate(a, b, c_in)[0]
+    
+    def _add_arrays(self, a, b, c_in, chunk_size=1 << 20):
+        """Add arrays in chunks, packing 64 operand pairs into each word of the
+        bit planes so that every gate is one bitwise operation per chunk.
+        """
+        
+        a, b, c_in = np.broadcast_arrays(a, b, c_in)
+        shape = a.shape
+        
+        # The sum has n bits whatever the operand dtype, so it needs a dtype
+        # that holds them: int64, uint64 or, past 64 bits, Python ints
+        if self.width < 64:
+            dtype = np.int64
+        elif self.width == 64:
+            dtype = np.uint64
+        else:
+            dtype = object
+        a, b = a.ravel().astype(dtype), b.ravel().astype(dtype)
+        c_in = c_in.ravel()
+        
+        SUM = np.zeros(a.size, dtype=dtype)
+        C_out = np.zeros(a.size, dtype=np.uint8)
+        
+        for start in range(0, a.size, chunk_size):
+            stop = min(start + chunk_size, a.size)
+            x, y = a[start:stop], b[start:stop]
+            
+            A = [pack_bits((x >> i) & 1) for i in range(self.width)]
+            B = [pack_bits((y >> i) & 1) for i in range(self.width)]
+            C = pack_bits(c_in[start:stop] & 1)
+            
+            (sums, carry), = self.circuit().evaluate_batch(A, B, C)
+            
+            for i, column in enumerate(sums):
+                SUM[start:stop] |= unpack_bits(column, stop - start).astype(dtype) << i
+            C_out[start:stop] = unpack_bits(carry, stop - start)
+        
+        return SUM.reshape(shape), C_out.reshape(shape)
+
+
+class RippleCarryAdder(Adder):
+    """Implementation of n-bit ripple carry adder, a chain of full adders."""
+    
+    def __init__(self, n_bits, label='RCA'):
+        super().__init__(n_bits, label)
+        self.adders = [FullAdder('{}_FA{}'.format(label, i)) for i in range(n_bits)]
+        
+        # Carry out of each full adder feeds carry in of the next
+        for lower, upper in zip(self.adders, self.adders[1:]):
+            Connector(lower, upper, cout=True, cin=True)
+    
+    def _expand(self, circuit, pins):
+        A, B, carry = pins
+        sums = []
+        for i, fa in enumerate(self.adders):
+            SUM, carry = fa._expand(circuit, [A[i], B[i], carry])
+            sums.append(SUM)
+        # A list of slots is a bus, read back as an integer
+        return sums, carry
+
+
+class CarryLookaheadAdder(Adder):
+    """Implementation of n-bit carry lookahead adder.
+    
+    Carries are computed from the generate and propagate signals of all lower
+    bits with a parallel prefix (Kogge-Stone) network, so the depth grows with
+    log(n) instead of n.
+    """
+    
+    def __init__(self, n_bits, label='CLA'):
+        super().__init__(n_bits, label)
+    
+    def _expand(self, circuit, pins):
+        A, B, C_in = pins
+        label = self.get_label()
+        
+        G = [circuit.emit('AND', a, b, label='{}_G{}'.format(label, i)) for i, (a, b) in enumerate(zip(A, B))]
+        P = [circuit.emit('XOR', a, b, label='{}_P{}'.format(label, i)) for i, (a, b) in enumerate(zip(A, B))]
+        
+        # Fold carry in into the generate signal of bit 0
+        G0 = list(G)
+        G0[0] = circuit.emit('OR', G[0], circuit.emit('AND', P[0], C_in))
+        
+        # After the round with distance d, G[i] and P[i] cover bits i-2d+1..i
+        group_G, group_P = G0, list(P)
+        d = 1
+        while d < self.width:
+            new_G, new_P = list(group_G), list(group_P)
+            for i in range(d, self.width):
+                new_G[i] = circuit.emit('OR', group_G[i], circuit.emit('AND', group_P[i], group_G[i - d]))
+                new_P[i] = circuit.emit('AND', group_P[i], group_P[i - d])
+            group_G, group_P = new_G, new_P
+            d *= 2
+        
+        # Carry into bit i is the group generate of bits 0..i-1
+        carries = [C_in] + group_G[:-1]
+        sums = [circuit.emit('XOR', p, c, label='{}_S{}'.format(label, i))
+                for i, (p, c) in enumerate(zip(P, carries))]
+        
+        return sums, group_G[-1]
+
+
+class EightBitFullAdder(RippleCarryAdder):
+    """Implementation of 8-bit full adder that prompts for its inputs."""
+    
+    # CIN is not used
+    pin_names = ('pinA', 'pinB')
+    # Inputs are prompted on every call
+    cache = False
+    
+    def __init__(self, label):
+        super().__init__(8, label)
     
     def perform_gate_logic(self):
         
         # For readability, prompt for decimal inputs
         self.pinA = int(input('Enter input A (8-bit integer, 0-255): '))
         self.pinB = int(input('Enter input B (8-bit integer, 0-255): '))
-        # Convert to binary string and reverse
-        pinA_bits = str(bin(self.pinA))[2:].zfill(8)[::-1]
-        pinB_bits = str(bin(self.pinB))[2:].zfill(8)[::-1]
         
-        # Set inputs for all gates
-        gates = ['HA1'] + ['FA'+str(i) for i in range(2, 9)]
-        for g, A, B in zip(gates, pinA_bits, pinB_bits):
-            getattr(self, g).pinA = int(A)
-            getattr(self, g).pinB = int(B)
+        return self.add(self.pinA, self.pinB)
+    
+    def _expand(self, circuit, pins):
+        # Carry in is tied to 0, whether or not a CIN pin was passed
+        A, B = pins[:2]
+        return super()._expand(circuit, [A, B, circuit.constant(0)])
+
+
+def exhaustive_columns(n):
+    """Return packed bit vectors enumerating all 2**n combinations of n inputs.
+    
+    Bit r of the kth vector is the kth bit (most significant first) of r.
+    """
+    
+    n_rows = 1 << n
+    columns = []
+    
+    for k in range(n):
+        half = 1 << (n - 1 - k)
+        # Ones in the upper half of each period, repeated by doubling
+        column = ((1 << half) - 1) << half
+        length = 2 * half
+        while length < n_rows:
+            column |= column << length
+            length *= 2
+        columns.append(column)
+    
+    return columns
+
+
+def pack_bits(bits):
+    """Pack an array of 0/1 values into a uint64 bit vector, 64 rows per word."""
+    
+    packed = np.packbits(np.asarray(bits, dtype=np.uint8), bitorder='little')
+    # Pad to a whole number of words
+    padded = np.zeros(-(-packed.size // 8) * 8, dtype=np.uint8)
+    padded[:packed.size] = packed
+    
+    return padded.view(np.uint64)
+
+
+def unpack_bits(words, n_rows):
+    """Unpack the first n_rows rows of a uint64 bit vector as 0/1 uint8 values."""
+    return np.unpackbits(words.view(np.uint8), count=n_rows, bitorder='little')
+
+
+class Circuit:
+    """Gate graph compiled to a flat evaluation schedule.
+    
+    Gates reachable from the outputs are topologically sorted once and
+    flattened into primitive operations, each reading and writing integer
+    slots of a value table. Evaluating the circuit then runs every gate exactly
+    once per input vector, without recursion.
+    
+    Unconnected pins become circuit inputs named '<gate label>.<pin name>' and
+    pins set to a value become constants. Use InputPin gates to feed the same
+    input to several pins.
+    """
+    
+    def __init__(self, outputs, inputs=None):
+        """
+        Parameters
+        ----------
+        outputs : list of LogicGate
+            Gates whose outputs are returned by evaluate().
+        
+        inputs : list of InputPin, default: None
+            Inputs in the order evaluate() takes them. Inputs not listed here
+            are appended in the order they are found.
+        """
+        
+        self.input_labels = []
+        self.slot_labels = []
+        self.schedule = []
+        self._input_slots = []
+        self._input_widths = []
+        self._program = []
+        self._constants = {}
+        self._gate_slots = {}
+        
+        for pin in inputs or []:
+            self._gate_slots[pin] = pin._expand(self, [])
+        
+        for gate in self._topological_order(outputs):
+            if gate not in self._gate_slots:
+                pins = [self._resolve_pin(gate, name) for name in gate.pin_names]
+                self._gate_slots[gate] = gate._expand(self, pins)
+        
+        self.outputs = [self._gate_slots[g] for g in outputs]
+    
+    def __repr__(self):
+        return 'Circuit({} inputs, {} gates)'.format(len(self.input_labels), len(self.schedule))
+    
+    @staticmethod
+    def _sources(gate):
+        """Return gates connected to the inputs of the gate."""
+        pins = [getattr(gate, name) for name in gate.pin_names]
+        return [p.get_from() for p in pins if isinstance(p, Connector)]
+    
+    def _topological_order(self, outputs):
+        """Return gates the outputs depend on, each after all of its sources."""
+        
+        order = []
+        state = {}
+        
+        # Iterative depth-first search so that deep circuits do not hit the
+        # recursion limit
+        for root in outputs:
+            stack = [(root, False)]
+            while stack:
+                gate, done = stack.pop()
+                if done:
+                    state[gate] = 'done'
+                    order.append(gate)
+                elif gate not in state:
+                    state[gate] = 'visiting'
+                    stack.append((gate, True))
+                    for source in reversed(self._sources(gate)):
+                        if state.get(source) == 'visiting':
+                            raise ValueError('Circuit contains a cycle through gate {}'.format(source.get_label()))
+                        if source not in state:
+                            stack.append((source, False))
         
-        # Concatenate outputs and reverse
-        output = ''.join([str(getattr(self, g).get_output()[0]) for g in gates])[::-1]
-        # Convert back to decimal
-        output = int(eval('0b' + output))
+        return order
+    
+    def _new_slot(self, label):
+        self.slot_labels.append(label)
+        return len(self.slot_labels) - 1
+    
+    def _resolve_pin(self, gate, name):
+        """Return the slot (or list of slots for multi-bit pins) feeding a pin."""
+        
+        source = getattr(gate, name)
+        label = '{}.{}'.format(gate.get_label(), name)
+        # CIN is always a single bit
+        width = None if name == 'C_in' else gate.width
+        
+        if isinstance(source, Connector):
+            if width is not None:
+                raise TypeError('Cannot connect a gate to multi-bit pin {}'.format(label))
+            slots = self._gate_slots[source.get_from()]
+            if source.cout is None:
+                return slots
+            elif source.cout:
+                return slots[1]
+            else:
+                return slots[0]
+        
+        elif source is None:
+            return self.add_input(label, width)
+        
+        elif width is None:
+            return self.constant(source)
+        
+        else:
+            return [self.constant((source >> i) & 1) for i in range(width)]
+    
+    def add_input(self, label, width=None):
+        """Add an input and return its slot, or a list of width slots (least
+        significant bit first) for multi-bit inputs.
+        """
+        
+        if width is None:
+            slots = [self._new_slot(label)]
+        else:
+            slots = [self._new_slot('{}[{}]'.format(label, i)) for i in range(width)]
+        self.input_labels.append(label)
+        self._input_slots.append(slots)
+        self._input_widths.append(width)
+        
+        return slots[0] if width is None else slots
+    
+    def constant(self, value):
+        """Return the slot holding a constant bit."""
+        
+        value = 1 if value else 0
+        if value not in self._constants:
+            self._constants[value] = self._new_slot(str(value))
+        
+        return self._constants[value]
+    
+    def emit(self, opcode, a, b=None, label=None):
+        """Append a primitive operation to the schedule and return its slot."""
+        
+        out = self._new_slot(label)
+        # Unary operations read the same slot twice
+        b = a if b is None else b
+        self.schedule.append((opcode, out, a, b))
+        self._program.append((OPS[opcode], out, a, b))
+        
+        return out
+    
+    def _run(self, inputs, mask, packed=False):
+        """Fill the value table from input values and execute the schedule."""
+        
+        if len(inputs) != len(self._input_slots):
+            raise TypeError('Expected {} inputs, got {}'.format(len(self._input_slots), len(inputs)))
+        
+        values = [0] * len(self.slot_labels)
+        for value, slot in self._constants.items():
+            values[slot] = mask if value else 0
+        
+        for value, slots, width in zip(inputs, self._input_slots, self._input_widths):
+            if width is None:
+                values[slots[0]] = value
+            # Packed multi-bit inputs already come as one vector per bit
+            elif packed:
+                for column, slot in zip(value, slots):
+                    values[slot] = column
+            else:
+                for i, slot in enumerate(slots):
+                    values[slot] = (value >> i) & 1
+        
+        for op, out, a, b in self._program:
+            values[out] = op(values[a], values[b], mask)
+        
+        return values
+    
+    def _read(self, values, slots, packed=False):
+        """Read an output described by a slot, a tuple of outputs or a bus."""
+        
+        if isinstance(slots, tuple):
+            return tuple(self._read(values, s, packed) for s in slots)
+        elif isinstance(slots, list):
+            if packed:
+                return [values[s] for s in slots]
+            return sum(values[s] << i for i, s in enumerate(slots))
+        else:
+            return values[slots]
+    
+    def evaluate(self, *inputs):
+        """Return the output of every output gate for one input vector."""
+        values = self._run(inputs, 1)
+        return tuple(self._read(values, slots) for slots in self.outputs)
+    
+    def evaluate_batch(self, *inputs, n_rows=None):
+        """Evaluate many input vectors with one pass over the schedule.
+        
+        Each input is a packed bit vector: a Python int whose bit r is the
+        input value in row r, or a NumPy unsigned integer array packing one row
+        per bit of each element. Every gate then does a single bitwise
+        operation over all rows. Multi-bit inputs take a list of vectors,
+        least significant bit first. Outputs are packed the same way.
+        
+        Parameters
+        ----------
+        n_rows : int, default: None
+            Number of rows packed in int vectors. Not needed for arrays.
+        """
+        
+        columns = [c for value, width in zip(inputs, self._input_widths)
+                   for c in ([value] if width is None else value)]
+        
+        if columns and not isinstance(columns[0], int):
+            # All ones in the dtype of the arrays
+            mask = ~(columns[0] ^ columns[0])
+        elif n_rows is None:
+            raise ValueError('n_rows is required for int bit vectors')
+        else:
+            mask = (1 << n_rows) - 1
+        
+        values = self._run(inputs, mask, packed=True)
+        return tuple(self._read(values, slots, packed=True) for slots in self.outputs)
+    
+    def truth_table(self):
+        """Return the outputs for all input combinations, computed in one pass.
+        
+        Rows are in the order of itertools.product over the inputs, so row r
+        has the inputs' bits concatenated (first input first) equal to r.
+        Bit r of each returned vector is the output in row r.
+        """
+        
+        n_bits = sum(len(slots) for slots in self._input_slots)
+        columns = exhaustive_columns(n_bits)
+        
+        inputs = []
+        pos = 0
+        for slots, width in zip(self._input_slots, self._input_widths):
+            if width is None:
+                inputs.append(columns[pos])
+            else:
+                # Most significant bit comes first in the row number
+                inputs.append(columns[pos:pos + width][::-1])
+            pos += len(slots)
+        
+        return self.evaluate_batch(*inputs, n_rows=1 << n_bits)
+    
+    def compile_truth_table(self, max_bits=24):
+        """Return a TruthTable of the circuit for O(1) lookup of outputs."""
+        
+        n_bits = sum(len(slots) for slots in self._input_slots)
+        if n_bits > max_bits:
+            raise ValueError('Truth table of {} input bits is too large, use to_bdd()'.format(n_bits))
+        
+        return TruthTable(self)
+    
+    def to_bdd(self, bdd=None, order=None):
+        """Build reduced ordered BDDs of the outputs.
+        
+        Parameters
+        ----------
+        bdd : BDD, default: None
+            Manager to build in. Circuits built in the same manager with the
+            same order can be compared node by node.
+        
+        order : list of str, default: None
+            Input bit labels (as in .slot_labels, e.g. 'A' or 'A[3]') from
+            the root of the BDD down. Defaults to the input order.
+        
+        Returns
+        -------
+        The manager and a tuple of output nodes, nested like evaluate_batch().
+        """
+        
+        input_slots = [slot for slots in self._input_slots for slot in slots]
+        if order is None:
+            order = [self.slot_labels[slot] for slot in input_slots]
+        position = {label: i for i, label in enumerate(order)}
+        
+        if bdd is None:
+            bdd = BDD(len(order))
+        
+        nodes = [None] * len(self.slot_labels)
+        for slot in input_slots:
+            nodes[slot] = bdd.var(position[self.slot_labels[slot]])
+        for value, slot in self._constants.items():
+            nodes[slot] = bdd.TRUE if value else bdd.FALSE
+        
+        for opcode, out, a, b in self.schedule:
+            nodes[out] = bdd.apply(opcode, nodes[a], nodes[b])
+        
+        return bdd, tuple(self._read(nodes, slots, packed=True) for slots in self.outputs)
+    
+    def levels(self):
+        """Return the level of every slot: 0 for inputs and constants,
+        otherwise one more than the highest level among its operands.
+        """
+        
+        levels = [0] * len(self.slot_labels)
+        for _, out, a, b in self.schedule:
+            levels[out] = max(levels[a], levels[b]) + 1
         
-        return output
+        return levels
+    
+    def depth(self):
+        """Return the number of gates on the longest input-to-output path."""
+        
+        levels = self.levels()
+        
+        def output_depth(slots):
+            if isinstance(slots, (tuple, list)):
+                return max(output_depth(s) for s in slots)
+            return levels[slots]
+        
+        return max(output_depth(slots) for slots in self.outputs)
+
+
+class TruthTable:
+    """Packed lookup table of a circuit's outputs for every input combination.
+    
+    Each output bit is stored as a bytes object holding one bit per row, so a
+    lookup is a row index computation plus one byte access per output bit.
+    """
+    
+    def __init__(self, circuit):
+        self.input_labels = list(circuit.input_labels)
+        self._widths = [len(slots) for slots in circuit._input_slots]
+        self.n_rows = 1 << sum(self._widths)
+        
+        n_bytes = (self.n_rows + 7) // 8
+        
+        def to_bytes(columns):
+            if isinstance(columns, tuple):
+                return tuple(to_bytes(c) for c in columns)
+            elif isinstance(columns, list):
+                return [to_bytes(c) for c in columns]
+            else:
+                return columns.to_bytes(n_bytes, 'little')
+        
+        self.outputs = to_bytes(circuit.truth_table())
+    
+    def __len__(self):
+        return self.n_rows
+    
+    def row(self, *inputs):
+        """Return the row number of an input vector."""
+        
+        r = 0
+        for value, width in zip(inputs, self._widths):
+            r = (r << width) | value
+        
+        return r
+    
+    def lookup(self, *inputs):
+        """Return the outputs for an input vector, like Circuit.evaluate()."""
+        
+        r = self.row(*inputs)
+        byte, bit = r >> 3, r & 7
+        
+        def read(table):
+            if isinstance(table, tuple):
+                return tuple(read(t) for t in table)
+            elif isinstance(table, list):
+                return sum(read(t) << i for i, t in enumerate(table))
+            else:
+                return (table[byte] >> bit) & 1
+        
+        return read(self.outputs)
+
+
+class EventSimulator:
+    """Event-driven simulation of a compiled Circuit.
+    
+    The simulator keeps the last output of every gate. When an input changes,
+    only the gates reading it are scheduled; a gate whose output changes
+    schedules its own readers in turn. Work is therefore proportional to the
+    number of gates that toggle rather than to the size of the circuit.
+    
+    Events are ordered by time, then by gate level, so with zero delays every
+    gate is evaluated at most once per time step after its inputs settle.
+    """
+    
+    def __init__(self, circuit, delay=0, delays=None):
+        """
+        Parameters
+        ----------
+        circuit : Circuit
+        
+        delay : int or float, default: 0
+            Propagation delay of gates not listed in delays.
+        
+        delays : dict, default: None
+            Propagation delay by gate label, e.g. {'G1': 2}.
+        """
+        
+        self.circuit = circuit
+        self.time = 0
+        self.evaluations = 0
+        self.toggles = 0
+        
+        delays = delays or {}
+        levels = circuit.levels()
+        
+        # Per operation: (level, delay); per slot: indices of operations reading it
+        self._ops = []
+        self._readers = [[] for _ in circuit.slot_labels]
+        for i, (_, out, a, b) in enumerate(circuit.schedule):
+            self._ops.append((levels[out], delays.get(circuit.slot_labels[out], delay)))
+            self._readers[a].append(i)
+            if b != a:
+                self._readers[b].append(i)
+        
+        self._queue = []
+        self._pending = set()
+        self.values = None
+    
+    def reset(self, *inputs):
+        """Evaluate the whole circuit once for the given inputs."""
+        
+        self.values = self.circuit._run(inputs, 1)
+        self.time = 0
+        self._queue = []
+        self._pending = set()
+        
+        return self.outputs()
+    
+    def outputs(self):
+        """Return the current output of every output gate."""
+        return tuple(self.circuit._read(self.values, slots) for slots in self.circuit.outputs)
+    
+    def _schedule(self, slot):
+        """Schedule every operation reading the slot after its delay."""
+        
+        for i in self._readers[slot]:
+            level, delay = self._ops[i]
+            event = (self.time + delay, level, i)
+            if event not in self._pending:
+                self._pending.add(event)
+                heapq.heappush(self._queue, event)
+    
+    def set_input(self, label, value):
+        """Change an input at the current time and schedule its readers."""
+        
+        if self.values is None:
+            raise RuntimeError('Call reset() with initial inputs first')
+        
+        k = self.circuit.input_labels.index(label)
+        slots = self.circuit._input_slots[k]
+        if self.circuit._input_widths[k] is None:
+            bits = [value]
+        else:
+            bits = [(value >> i) & 1 for i in range(len(slots))]
+        
+        for slot, bit in zip(slots, bits):
+            if self.values[slot] != bit:
+                self.values[slot] = bit
+                self._schedule(slot)
+    
+    def run(self, until=None):
+        """Process events up to the given time (all events if None) and return
+        the outputs.
+        """
+        
+        program = self.circuit._program
+        values = self.values
+        
+        while self._queue and (until is None or self._queue[0][0] <= until):
+            event = heapq.heappop(self._queue)
+            self._pending.discard(event)
+            self.time = event[0]
+            
+            op, out, a, b = program[event[2]]
+            self.evaluations += 1
+            new = op(values[a], values[b], 1)
+            if new != values[out]:
+                values[out] = new
+                self.toggles += 1
+                self._schedule(out)
+        
+        if until is not None:
+            self.time = max(self.time, until)
+        
+        return self.outputs()
+    
+    def step(self, *inputs):
+        """Apply a full input vector, let the circuit settle and return the
+        outputs.
+        """
+        
+        for label, value in zip(self.circuit.input_labels, inputs):
+            self.set_input(label, value)
+        
+        return self.run()
 
 
 def main():
     
+    A, B, C, D = (InputPin(label) for label in 'ABCD')
+    
     # NOT((A and B) or (C and D))
     g1 = AndGate('G1')
     g2 = AndGate('G2')
@@ -356,15 +1161,24 @@ def main():
     c4 = Connector(g5, g7)
     c5 = Connector(g6, g7)
     
+    # Feed each input to both circuits
+    for source, gates in [(A, (g1, g5)), (B, (g1, g5)), (C, (g2, g6)), (D, (g2, g6))]:
+        for g in gates:
+            Connector(source, g)
+    
+    circuit = Circuit([g4, g7], inputs=[A, B, C, D])
+    
+    # Evaluate all 16 rows at once, then compare the packed outputs bitwise
+    out1, out2 = circuit.truth_table()
+    equal = ~(out1 ^ out2)
+    
     print('A B C D   Equal')
-    for A, B, C, D in product(*[[0, 1]]*4):
-        
-        g1.pinA = g5.pinA = A
-        g1.pinB = g5.pinB = B
-        g2.pinA = g6.pinA = C
-        g2.pinB = g6.pinB = D
-        
-        print('{} {} {} {} : {!s:>5}'.format(A, B, C, D, g4.get_output() == g7.get_output()))
+    for r, (a, b, c, d) in enumerate(product(*[[0, 1]]*4)):
+        print('{} {} {} {} : {!s:>5}'.format(a, b, c, d, bool((equal >> r) & 1)))
+    
+    # Canonical BDDs are equivalent exactly when they are the same node
+    bdd, (node1, node2) = circuit.to_bdd()
+    print('Equivalent (BDD):', node1 == node2)
 
 
 if __name__ == '__main__':
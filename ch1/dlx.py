@@ -0,0 +1,152 @@
+class DancingLinks:
+    """Exact cover solver using Knuth's Algorithm X with dancing links.
+    
+    The sparse 0/1 matrix is a torus of doubly linked nodes. Covering a
+    column unlinks it and every row that intersects it, and uncovering
+    relinks them in reverse order, so backtracking costs no more than the
+    covering did. Nodes are indices into parallel lists rather than objects.
+    """
+    
+    def __init__(self, n_columns, rows):
+        """
+        Parameters
+        ----------
+        n_columns : int
+            Number of columns (constraints), all of which must be covered.
+        
+        rows : list of list of int
+            Columns covered by each row (option).
+        """
+        
+        # Node 0 is the root, nodes 1..n_columns are column headers
+        n = n_columns + 1
+        self.left = [i - 1 for i in range(n)]
+        self.right = [i + 1 for i in range(n)]
+        self.left[0], self.right[n - 1] = n - 1, 0
+        self.up = list(range(n))
+        self.down = list(range(n))
+        self.column = list(range(n))
+        self.row = [-1] * n
+        self.size = [0] * n
+        
+        for r, columns in enumerate(rows):
+            first = None
+            for c in columns:
+                self._append(r, c + 1)
+                node = len(self.row) - 1
+                if first is None:
+                    first = node
+                else:
+                    # Insert at the end of the row's circular list
+                    self.left[node] = self.left[first]
+                    self.right[node] = first
+                    self.right[self.left[first]] = node
+                    self.left[first] = node
+    
+    def _append(self, r, c):
+        """Add a node for row r at the bottom of column header c."""
+        
+        node = len(self.row)
+        self.left.append(node)
+        self.right.append(node)
+        self.up.append(self.up[c])
+        self.down.append(c)
+        self.down[self.up[c]] = node
+        self.up[c] = node
+        self.column.append(c)
+        self.row.append(r)
+        self.size[c] += 1
+    
+    def _cover(self, c):
+        """Remove column c and every row intersecting it."""
+        
+        left, right, up, down = self.left, self.right, self.up, self.down
+        right[left[c]] = right[c]
+        left[right[c]] = left[c]
+        
+        i = down[c]
+        while i != c:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                self.size[self.column[j]] -= 1
+                j = right[j]
+            i = down[i]
+    
+    def _uncover(self, c):
+        """Undo _cover(c), relinking in the reverse order."""
+        
+        left, right, up, down = self.left, self.right, self.up, self.down
+        
+        i = up[c]
+        while i != c:
+            j = left[i]
+            while j != i:
+                self.size[self.column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        
+        right[left[c]] = c
+        left[right[c]] = c
+    
+    def _choose_column(self):
+        """Return the column with the fewest rows, or None if none are left."""
+        
+        right, size = self.right, self.size
+        best, best_size = None, None
+        c = right[0]
+        while c != 0:
+            if best is None or size[c] < best_size:
+                best, best_size = c, size[c]
+                if best_size <= 1:
+                    break
+            c = right[c]
+        
+        return best
+    
+    def solutions(self):
+        """Yield every exact cover as a list of row indices."""
+        
+        partial = []
+        
+        def search():
+            c = self._choose_column()
+            if c is None:
+                yield list(partial)
+                return
+            
+            self._cover(c)
+            r = self.down[c]
+            while r != c:
+                partial.append(self.row[r])
+                j = self.right[r]
+                while j != r:
+                    self._cover(self.column[j])
+                    j = self.right[j]
+                
+                # Recursion depth is at most the number of rows chosen
+                yield from search()
+                
+                j = self.left[r]
+                while j != r:
+                    self._uncover(self.column[j])
+                    j = self.left[j]
+                partial.pop()
+                r = self.down[r]
+            self._uncover(c)
+        
+        yield from search()
+    
+    def count(self, limit=None):
+        """Return the number of exact covers, stopping early at limit."""
+        
+        n = 0
+        for _ in self.solutions():
+            n += 1
+            if limit is not None and n >= limit:
+                break
+        
+        return n
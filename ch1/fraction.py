@@ -1,3 +1,11 @@
+import math
+import sys
+
+
+_HASH_MODULUS = sys.hash_info.modulus
+_HASH_INF = sys.hash_info.inf
+
+
 def gcd(m, n):
     """Find the greatest common divisor with the Euclidean algorithm."""
     
@@ -9,7 +17,13 @@ def gcd(m, n):
 
 
 class Fraction:
-    """Implementation of fraction."""
+    """Implementation of fraction.
+    
+    Fractions are always stored in lowest terms with a positive denominator.
+    """
+    
+    # No per-instance __dict__, which roughly halves the size of a fraction
+    __slots__ = ('num', 'den')
     
     def __init__(self, num, den):
         
@@ -17,18 +31,28 @@ class Fraction:
         if not isinstance(num, int) or not isinstance(den, int):
             raise TypeError('Both numerator and denominator must be integers')
         
+        if den == 0:
+            raise ZeroDivisionError('Fraction({}, 0)'.format(num))
+        
         # Handle negative denominator
         if den < 0:
-            self.num = -num
-            self.den = -den
-        else:
-            self.num = num
-            self.den = den
+            num = -num
+            den = -den
         
         # Reduce fraction
-        common = gcd(self.num, self.den)
-        self.num //= common
-        self.den //= common
+        common = math.gcd(num, den)
+        self.num = num // common
+        self.den = den // common
+    
+    @classmethod
+    def _from_reduced(cls, num, den):
+        """Create a fraction from a numerator and a positive denominator that
+        are already in lowest terms, skipping validation and reduction.
+        """
+        f = object.__new__(cls)
+        f.num = num
+        f.den = den
+        return f
     
     def __repr__(self):
         return 'Fraction({}, {})'.format(self.num, self.den)
@@ -36,6 +60,22 @@ class Fraction:
     def __str__(self):
         return '{}/{}'.format(self.num, self.den)
     
+    def __hash__(self):
+        """Hash consistently with ints and floats of equal value, like
+        fractions.Fraction.
+        """
+        
+        try:
+            dinv = pow(self.den, -1, _HASH_MODULUS)
+        except ValueError:
+            # Denominator is divisible by the modulus
+            hash_ = _HASH_INF
+        else:
+            hash_ = hash(hash(abs(self.num)) * dinv)
+        
+        result = hash_ if self.num >= 0 else -hash_
+        return -2 if result == -1 else result
+    
     def get_num(self):
         """Return numerator of the fraction."""
         return self.num
@@ -46,72 +86,246 @@ class Fraction:
     
     def __add__(self, other):
         """Addition operator."""
-        newnum = self.num*other.den + self.den*other.num
-        newden = self.den * other.den
-        return Fraction(newnum, newden)
+        
+        if isinstance(other, int):
+            # n/d + k = (n + kd)/d is still in lowest terms
+            return self._from_reduced(self.num + other*self.den, self.den)
+        elif not isinstance(other, Fraction):
+            return NotImplemented
+        
+        na, da = self.num, self.den
+        nb, db = other.num, other.den
+        
+        # Dividing out gcd(da, db) early keeps intermediates small and makes
+        # the final reduction cheaper (Knuth, TAOCP 4.5.1)
+        g = math.gcd(da, db)
+        if g == 1:
+            return self._from_reduced(na*db + da*nb, da * db)
+        
+        s = da // g
+        t = na*(db // g) + nb*s
+        g2 = math.gcd(t, g)
+        if g2 == 1:
+            return self._from_reduced(t, s * db)
+        return self._from_reduced(t // g2, s * (db // g2))
     
     def __radd__(self, other):
-        """Reversed addition operator."""
+        """Reversed addition operator, which lets sum() start from 0."""
         return self.__add__(other)
     
-    def __iadd__(self, other):
-        """In-place addition operator."""
-        self = self.__add__(other)
-        return self
-    
     def __sub__(self, other):
         """Subtraction operator."""
-        newnum = self.num*other.den - self.den*other.num
-        newden = self.den * other.den
-        return Fraction(newnum, newden)
+        
+        if isinstance(other, int):
+            return self._from_reduced(self.num - other*self.den, self.den)
+        elif not isinstance(other, Fraction):
+            return NotImplemented
+        
+        na, da = self.num, self.den
+        nb, db = other.num, other.den
+        
+        g = math.gcd(da, db)
+        if g == 1:
+            return self._from_reduced(na*db - da*nb, da * db)
+        
+        s = da // g
+        t = na*(db // g) - nb*s
+        g2 = math.gcd(t, g)
+        if g2 == 1:
+            return self._from_reduced(t, s * db)
+        return self._from_reduced(t // g2, s * (db // g2))
+    
+    def __rsub__(self, other):
+        """Reversed subtraction operator."""
+        
+        if isinstance(other, int):
+            return self._from_reduced(other*self.den - self.num, self.den)
+        return NotImplemented
+    
+    def __neg__(self):
+        return self._from_reduced(-self.num, self.den)
     
     def __mul__(self, other):
         """Multiplication operator."""
-        newnum = self.num * other.num
-        newden = self.den * other.den
-        return Fraction(newnum, newden)
+        
+        if isinstance(other, int):
+            g = math.gcd(other, self.den)
+            return self._from_reduced(self.num * (other // g), self.den // g)
+        elif not isinstance(other, Fraction):
+            return NotImplemented
+        
+        na, da = self.num, self.den
+        nb, db = other.num, other.den
+        
+        # Cancel across the operands before multiplying
+        g1 = math.gcd(na, db)
+        if g1 > 1:
+            na //= g1
+            db //= g1
+        g2 = math.gcd(nb, da)
+        if g2 > 1:
+            nb //= g2
+            da //= g2
+        
+        return self._from_reduced(na * nb, da * db)
+    
+    def __rmul__(self, other):
+        """Reversed multiplication operator."""
+        return self.__mul__(other)
     
     def __truediv__(self, other):
         """Division operator."""
-        newnum = self.num * other.den
-        newden = self.den * other.num
-        return Fraction(newnum, newden)
+        
+        if isinstance(other, int):
+            nb, db = other, 1
+        elif isinstance(other, Fraction):
+            nb, db = other.num, other.den
+        else:
+            return NotImplemented
+        
+        return self._div(self.num, self.den, nb, db)
+    
+    def __rtruediv__(self, other):
+        """Reversed division operator."""
+        
+        if isinstance(other, int):
+            return self._div(other, 1, self.num, self.den)
+        return NotImplemented
+    
+    @classmethod
+    def _div(cls, na, da, nb, db):
+        """Return (na/da) / (nb/db) for fractions in lowest terms."""
+        
+        if nb == 0:
+            raise ZeroDivisionError('Fraction({}, 0)'.format(na * db))
+        
+        # Cancel across the operands before multiplying
+        g1 = math.gcd(na, nb)
+        if g1 > 1:
+            na //= g1
+            nb //= g1
+        g2 = math.gcd(db, da)
+        if g2 > 1:
+            db //= g2
+            da //= g2
+        
+        num, den = na * db, da * nb
+        if den < 0:
+            num, den = -num, -den
+        return cls._from_reduced(num, den)
+    
+    def _cross(self, other):
+        """Return cross products that compare like self and other, or None if
+        other is not a fraction or an int.
+        """
+        
+        if isinstance(other, int):
+            return self.num, other * self.den
+        elif isinstance(other, Fraction):
+            return self.num * other.den, other.num * self.den
+        else:
+            return None
     
     def __gt__(self, other):
         """Greater than operator."""
-        firstnum = self.num * other.den
-        secondnum = other.num * self.den
-        return firstnum > secondnum
+        cross = self._cross(other)
+        return NotImplemented if cross is None else cross[0] > cross[1]
     
     def __ge__(self, other):
         """Greater than or equal to operator."""
-        firstnum = self.num * other.den
-        secondnum = other.num * self.den
-        return firstnum >= secondnum
+        cross = self._cross(other)
+        return NotImplemented if cross is None else cross[0] >= cross[1]
     
     def __lt__(self, other):
         """Less than operator."""
-        firstnum = self.num * other.den
-        secondnum = other.num * self.den
-        return firstnum < secondnum
+        cross = self._cross(other)
+        return NotImplemented if cross is None else cross[0] < cross[1]
     
     def __le__(self, other):
         """Less than or equal to operator."""
-        firstnum = self.num * other.den
-        secondnum = other.num * self.den
-        return firstnum <= secondnum
+        cross = self._cross(other)
+        return NotImplemented if cross is None else cross[0] <= cross[1]
     
     def __eq__(self, other):
         """Equality operator."""
-        firstnum = self.num * other.den
-        secondnum = other.num * self.den
-        return firstnum == secondnum
+        
+        # Both fractions are in lowest terms
+        if isinstance(other, Fraction):
+            return self.num == other.num and self.den == other.den
+        elif isinstance(other, int):
+            return self.den == 1 and self.num == other
+        else:
+            return NotImplemented
     
     def __ne__(self, other):
         """Not equal to operator."""
-        firstnum = self.num * other.den
-        secondnum = other.num * self.den
-        return firstnum != secondnum
+        
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+
+class FractionAccumulator:
+    """Running sum of fractions and ints with deferred reduction.
+    
+    Terms are added over the least common multiple of the denominators seen
+    so far, without reducing the numerator. The sum is reduced once, when it
+    is read with value(). Adding a term whose denominator already divides the
+    running one costs a multiplication and an addition.
+    """
+    
+    __slots__ = ('_num', '_den')
+    
+    def __init__(self, start=0):
+        self._num = 0
+        self._den = 1
+        self.add(start)
+    
+    def __repr__(self):
+        return 'FractionAccumulator({!r})'.format(self.value())
+    
+    def add(self, other):
+        """Add a Fraction or an int to the running sum."""
+        
+        if isinstance(other, int):
+            self._num += other * self._den
+            return
+        elif not isinstance(other, Fraction):
+            raise TypeError('Can only add Fraction or int, not {}'.format(type(other).__name__))
+        
+        den = other.den
+        if self._den % den == 0:
+            self._num += other.num * (self._den // den)
+        else:
+            # Grow the common denominator to lcm(self._den, den)
+            g = math.gcd(self._den, den)
+            scale = den // g
+            self._num = self._num*scale + other.num*(self._den // g)
+            self._den *= scale
+    
+    def __iadd__(self, other):
+        """In-place addition operator."""
+        self.add(other)
+        return self
+    
+    def extend(self, iterable):
+        """Add every term of an iterable."""
+        
+        add = self.add
+        for term in iterable:
+            add(term)
+    
+    def value(self):
+        """Return the sum as a reduced Fraction."""
+        return Fraction(self._num, self._den)
+
+
+def sum_fractions(iterable, start=0):
+    """Return the sum of Fractions and ints, reducing only once at the end."""
+    
+    acc = FractionAccumulator(start)
+    acc.extend(iterable)
+    
+    return acc.value()
 
 
 def main():
@@ -0,0 +1,330 @@
+import numpy as np
+
+from fraction import Fraction
+
+
+# Products below this bound fit in int64 with room for the sum of two of them.
+# Magnitudes are estimated in float64, whose rounding error is far smaller
+# than the margin left.
+_LIMIT = float(2 ** 62)
+_INT64_MAX = 2 ** 63 - 1
+
+
+def _as_int_array(a):
+    """Convert integers to an int64 array, or an object array if they are too large."""
+    
+    array = np.asarray(a)
+    # NumPy infers float64 for an empty list, and for ints beyond int64
+    # mixed with negative ones
+    if array.dtype.kind == 'f' and not isinstance(a, np.ndarray):
+        array = np.array(a, dtype=object)
+    if array.dtype == object:
+        if not all(isinstance(x, (int, np.integer)) for x in array.flat):
+            raise TypeError('Both numerator and denominator must be integers')
+        return _shrink(array)
+    if not np.issubdtype(array.dtype, np.integer):
+        raise TypeError('Both numerator and denominator must be integers')
+    if array.dtype == np.uint64 and array.size and array.max() > _INT64_MAX:
+        return array.astype(object)
+    
+    array = array.astype(np.int64)
+    # Negating -2**63 wraps around in int64, so it is kept as a Python int
+    if array.size and array.min() < -_INT64_MAX:
+        return array.astype(object)
+    
+    return array
+
+
+def _shrink(a):
+    """Return an object array as int64 if every value fits."""
+    
+    if a.dtype != object:
+        return a
+    if a.size == 0 or np.max(np.abs(a)) <= _INT64_MAX:
+        return a.astype(np.int64)
+    
+    return a
+
+
+def _product_dtype(*pairs):
+    """Return int64 if x * y fits for every (x, y) pair of arrays, else object."""
+    
+    for x, y in pairs:
+        if x.dtype == object or y.dtype == object:
+            return object
+        if np.any(np.abs(x.astype(np.float64)) * np.abs(y.astype(np.float64)) >= _LIMIT):
+            return object
+    
+    return np.int64
+
+
+class FractionArray:
+    """Array of fractions stored as parallel numerator and denominator arrays.
+    
+    Values are int64 NumPy arrays, switching to object arrays of Python ints
+    when an operation would overflow, and back once results fit again. Like
+    Fraction, elements are always in lowest terms with positive denominators.
+    """
+    
+    def __init__(self, num, den=1):
+        """
+        Parameters
+        ----------
+        num : array-like of int
+        
+        den : array-like of int, default: 1
+            Broadcast against num.
+        """
+        
+        num, den = np.broadcast_arrays(_as_int_array(num), _as_int_array(den))
+        
+        if np.any(den == 0):
+            raise ZeroDivisionError('FractionArray with zero denominator')
+        
+        # Handle negative denominators
+        sign = np.where(den < 0, -1, 1)
+        num, den = num * sign, den * sign
+        
+        self.num, self.den = self._reduce(num, den)
+    
+    @classmethod
+    def _from_reduced(cls, num, den):
+        """Create an array from numerators and positive denominators that are
+        already in lowest terms.
+        """
+        fa = object.__new__(cls)
+        fa.num = num
+        fa.den = den
+        return fa
+    
+    @classmethod
+    def from_fractions(cls, fractions):
+        """Create an array from an iterable of Fraction objects."""
+        
+        fractions = list(fractions)
+        num = [f.num for f in fractions]
+        den = [f.den for f in fractions]
+        
+        return cls._from_reduced(_as_int_array(num), _as_int_array(den))
+    
+    @staticmethod
+    def _reduce(num, den):
+        """Divide numerators and denominators by their gcd elementwise."""
+        
+        common = np.gcd(num, den)
+        # gcd(0, den) = den reduces zero to 0/1
+        return _shrink(num // common), _shrink(den // common)
+    
+    def __repr__(self):
+        return 'FractionArray({}, {})'.format(self.num.tolist(), self.den.tolist())
+    
+    def __str__(self):
+        return '[{}]'.format(', '.join(str(f) for f in self))
+    
+    def __len__(self):
+        return len(self.num)
+    
+    @property
+    def shape(self):
+        return self.num.shape
+    
+    def __getitem__(self, index):
+        num, den = self.num[index], self.den[index]
+        if np.ndim(num) == 0:
+            return Fraction._from_reduced(int(num), int(den))
+        return self._from_reduced(num, den)
+    
+    def __iter__(self):
+        for num, den in zip(self.num.tolist(), self.den.tolist()):
+            yield Fraction._from_reduced(num, den)
+    
+    def to_float(self):
+        """Return the values as a float64 array."""
+        return self.num.astype(np.float64) / self.den.astype(np.float64)
+    
+    @classmethod
+    def _coerce(cls, other):
+        """Return numerator and denominator arrays of an operand, or None if
+        the operand type is not supported.
+        """
+        
+        if isinstance(other, FractionArray):
+            return other.num, other.den
+        elif isinstance(other, Fraction):
+            return _as_int_array(other.num), _as_int_array(other.den)
+        elif isinstance(other, (int, np.integer)):
+            return _as_int_array(other), _as_int_array(1)
+        else:
+            return None
+    
+    def _add(self, other, sign):
+        """Return self + sign * other."""
+        
+        operands = self._coerce(other)
+        if operands is None:
+            return NotImplemented
+        na, da = self.num, self.den
+        nb, db = operands
+        
+        dtype = _product_dtype((na, db), (nb, da), (da, db))
+        na, da, nb, db = (x.astype(dtype) for x in (na, da, nb, db))
+        
+        num = na*db + sign*(nb*da)
+        den = da * db
+        
+        return self._from_reduced(*self._reduce(num, den))
+    
+    def __add__(self, other):
+        """Addition operator."""
+        return self._add(other, 1)
+    
+    def __radd__(self, other):
+        """Reversed addition operator."""
+        return self._add(other, 1)
+    
+    def __sub__(self, other):
+        """Subtraction operator."""
+        return self._add(other, -1)
+    
+    def __rsub__(self, other):
+        """Reversed subtraction operator."""
+        return -self._add(other, -1)
+    
+    def __neg__(self):
+        return self._from_reduced(-self.num, self.den)
+    
+    def _mul(self, num, den):
+        """Multiply by fractions num/den, with den of either sign."""
+        
+        na, da = self.num, self.den
+        
+        # Cancel across the operands first to keep products small
+        g1 = np.gcd(na, den)
+        g2 = np.gcd(num, da)
+        na, den = na // g1, den // g1
+        num, da = num // g2, da // g2
+        
+        dtype = _product_dtype((na, num), (da, den))
+        num = na.astype(dtype) * num.astype(dtype)
+        den = da.astype(dtype) * den.astype(dtype)
+        
+        sign = np.where(den < 0, -1, 1)
+        return self._from_reduced(_shrink(num * sign), _shrink(den * sign))
+    
+    def __mul__(self, other):
+        """Multiplication operator."""
+        
+        operands = self._coerce(other)
+        if operands is None:
+            return NotImplemented
+        
+        return self._mul(*operands)
+    
+    def __rmul__(self, other):
+        """Reversed multiplication operator."""
+        return self.__mul__(other)
+    
+    def __truediv__(self, other):
+        """Division operator."""
+        
+        operands = self._coerce(other)
+        if operands is None:
+            return NotImplemented
+        num, den = operands
+        
+        if np.any(num == 0):
+            raise ZeroDivisionError('FractionArray division by zero')
+        
+        return self._mul(den, num)
+    
+    def __rtruediv__(self, other):
+        """Reversed division operator."""
+        
+        operands = self._coerce(other)
+        if operands is None:
+            return NotImplemented
+        
+        if np.any(self.num == 0):
+            raise ZeroDivisionError('FractionArray division by zero')
+        
+        # The reciprocal den/num, whose negative denominators _mul handles
+        return self._from_reduced(self.den, self.num)._mul(*operands)
+    
+    def _compare(self, other):
+        """Return cross products whose comparison matches self vs other."""
+        
+        operands = self._coerce(other)
+        if operands is None:
+            return None
+        nb, db = operands
+        
+        # Denominators are positive, so a/b < c/d exactly when a*d < c*b
+        dtype = _product_dtype((self.num, db), (nb, self.den))
+        return (self.num.astype(dtype) * db.astype(dtype),
+                nb.astype(dtype) * self.den.astype(dtype))
+    
+    def __lt__(self, other):
+        """Less than operator."""
+        products = self._compare(other)
+        return NotImplemented if products is None else products[0] < products[1]
+    
+    def __le__(self, other):
+        """Less than or equal to operator."""
+        products = self._compare(other)
+        return NotImplemented if products is None else products[0] <= products[1]
+    
+    def __gt__(self, other):
+        """Greater than operator."""
+        products = self._compare(other)
+        return NotImplemented if products is None else products[0] > products[1]
+    
+    def __ge__(self, other):
+        """Greater than or equal to operator."""
+        products = self._compare(other)
+        return NotImplemented if products is None else products[0] >= products[1]
+    
+    def __eq__(self, other):
+        """Equality operator."""
+        operands = self._coerce(other)
+        if operands is None:
+            return NotImplemented
+        # Both sides are in lowest terms
+        return (self.num == operands[0]) & (self.den == operands[1])
+    
+    def __ne__(self, other):
+        """Not equal to operator."""
+        operands = self._coerce(other)
+        if operands is None:
+            return NotImplemented
+        return (self.num != operands[0]) | (self.den != operands[1])
+    
+    __hash__ = None
+    
+    def _tree_reduce(self, op, identity):
+        """Combine all elements pairwise, halving the array at every step.
+        
+        Pairing neighbours keeps every partial result built from few terms,
+        so denominators grow far slower than in a left-to-right loop.
+        """
+        
+        if len(self) == 0:
+            return identity
+        
+        fa = self._from_reduced(self.num.ravel(), self.den.ravel())
+        while len(fa) > 1:
+            # Carry the odd element over to the next round
+            carry = fa[-1:] if len(fa) % 2 else None
+            fa = op(fa[0:len(fa) - 1:2], fa[1::2])
+            if carry is not None:
+                fa = fa._from_reduced(np.concatenate([fa.num, carry.num]),
+                                      np.concatenate([fa.den, carry.den]))
+        
+        return fa[0]
+    
+    def sum(self):
+        """Return the sum of all elements as a Fraction."""
+        return self._tree_reduce(lambda a, b: a + b, Fraction(0, 1))
+    
+    def prod(self):
+        """Return the product of all elements as a Fraction."""
+        return self._tree_reduce(lambda a, b: a * b, Fraction(1, 1))
@@ -0,0 +1,172 @@
+"""Benchmark Fraction against fractions.Fraction and float.
+
+Run as a script to time construction, arithmetic, comparisons and series
+summation across operand magnitudes, write the results as JSON or CSV, and
+optionally fail when any timing regresses past a saved baseline:
+
+    python fraction_benchmark.py --output results.json
+    python fraction_benchmark.py --baseline results.json --threshold 1.2
+"""
+
+import argparse
+import csv
+import fractions
+import json
+import random
+import sys
+import timeit
+
+from fraction import Fraction
+
+
+IMPLEMENTATIONS = {
+    'Fraction': Fraction,
+    'fractions.Fraction': fractions.Fraction,
+    'float': lambda num, den: num / den,
+}
+
+# Upper bounds for random numerators and denominators
+MAGNITUDES = [10**3, 10**9, 10**18, 10**40]
+
+OPERATIONS = ['construct', 'add', 'sub', 'mul', 'truediv', 'lt', 'eq', 'sum']
+
+SERIES_LENGTH = 200
+
+FIELDS = ['implementation', 'operation', 'magnitude', 'seconds']
+
+
+def make_statement(make, operation, magnitude, rng):
+    """Return a zero-argument callable performing the operation once."""
+    
+    n1, n2 = rng.randrange(1, magnitude), rng.randrange(1, magnitude)
+    d1, d2 = rng.randrange(1, magnitude), rng.randrange(1, magnitude)
+    x, y = make(n1, d1), make(n2, d2)
+    
+    if operation == 'construct':
+        return lambda: make(n1, d1)
+    elif operation == 'add':
+        return lambda: x + y
+    elif operation == 'sub':
+        return lambda: x - y
+    elif operation == 'mul':
+        return lambda: x * y
+    elif operation == 'truediv':
+        return lambda: x / y
+    elif operation == 'lt':
+        return lambda: x < y
+    elif operation == 'eq':
+        return lambda: x == y
+    elif operation == 'sum':
+        terms = [make(1, magnitude + k) for k in range(SERIES_LENGTH)]
+        return lambda: sum(terms)
+    else:
+        raise ValueError('Unknown operation {}'.format(operation))
+
+
+def run(implementations=None, operations=None, magnitudes=None, number=2000,
+        repeat=5, seed=0):
+    """Time every combination and return a list of result dicts.
+    
+    The time of each combination is the best of `repeat` runs of `number`
+    calls, divided by `number`. Series summation runs number // 100 times.
+    """
+    
+    implementations = implementations or list(IMPLEMENTATIONS)
+    operations = operations or OPERATIONS
+    magnitudes = magnitudes or MAGNITUDES
+    
+    results = []
+    for name in implementations:
+        for operation in operations:
+            for magnitude in magnitudes:
+                # Same operands for every implementation
+                rng = random.Random(seed)
+                stmt = make_statement(IMPLEMENTATIONS[name], operation, magnitude, rng)
+                n = max(1, number // 100) if operation == 'sum' else number
+                best = min(timeit.Timer(stmt).repeat(repeat=repeat, number=n))
+                results.append({'implementation': name,
+                                'operation': operation,
+                                'magnitude': magnitude,
+                                'seconds': best / n})
+    
+    return results
+
+
+def write_results(results, path, fmt='json'):
+    """Write results to a file as JSON or CSV, or to stdout if path is None."""
+    
+    f = open(path, 'w', newline='') if path else sys.stdout
+    try:
+        if fmt == 'json':
+            json.dump(results, f, indent=2)
+            f.write('\n')
+        else:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+    finally:
+        if path:
+            f.close()
+
+
+def load_results(path):
+    """Read results written by write_results(), in either format."""
+    
+    with open(path, newline='') as f:
+        if path.endswith('.csv'):
+            return [{'implementation': row['implementation'],
+                     'operation': row['operation'],
+                     'magnitude': int(row['magnitude']),
+                     'seconds': float(row['seconds'])} for row in csv.DictReader(f)]
+        return json.load(f)
+
+
+def find_regressions(results, baseline, threshold=1.2):
+    """Return (result, baseline seconds) for every timing more than threshold
+    times slower than the matching baseline timing.
+    """
+    
+    def key(r):
+        return r['implementation'], r['operation'], r['magnitude']
+    
+    previous = {key(r): r['seconds'] for r in baseline}
+    
+    return [(r, previous[key(r)]) for r in results
+            if key(r) in previous and r['seconds'] > threshold * previous[key(r)]]
+
+
+def main(argv=None):
+    
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', help='file to write results to (default: stdout)')
+    parser.add_argument('--format', choices=['json', 'csv'],
+                        help='output format (default: from the file extension, else json)')
+    parser.add_argument('--implementations', nargs='+', choices=list(IMPLEMENTATIONS))
+    parser.add_argument('--operations', nargs='+', choices=OPERATIONS)
+    parser.add_argument('--magnitudes', nargs='+', type=int)
+    parser.add_argument('--number', type=int, default=2000, help='calls per timing run')
+    parser.add_argument('--repeat', type=int, default=5, help='timing runs, best is kept')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', help='results file to check for regressions against')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='slowdown ratio counted as a regression')
+    args = parser.parse_args(argv)
+    
+    fmt = args.format or ('csv' if args.output and args.output.endswith('.csv') else 'json')
+    
+    results = run(args.implementations, args.operations, args.magnitudes,
+                  args.number, args.repeat, args.seed)
+    write_results(results, args.output, fmt)
+    
+    if args.baseline:
+        regressions = find_regressions(results, load_results(args.baseline), args.threshold)
+        for r, previous in regressions:
+            print('Regression: {implementation} {operation} magnitude {magnitude}: '.format(**r)
+                  + '{:.3g}s -> {:.3g}s'.format(previous, r['seconds']), file=sys.stderr)
+        return 1 if regressions else 0
+    
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
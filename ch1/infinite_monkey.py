@@ -1,19 +1,29 @@
+import argparse
+import os
 import string
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 
 
 GOAL = 'methinks it is like a weasel'
 LETTERS = list(string.ascii_lowercase) + [' ']
+# Position of each letter in LETTERS, used to encode strings as uint8 arrays
+LETTER_CODES = {c: i for i, c in enumerate(LETTERS)}
+
+SearchResult = namedtuple('SearchResult', ['string', 'generations', 'trials', 'seconds'])
 
 
-def generate():
+def generate(goal=GOAL, rng=np.random):
     """Generate a random string the same length as the goal string."""
-    return ''.join(np.random.choice(LETTERS, len(GOAL)))
+    return ''.join(rng.choice(LETTERS, len(goal)))
 
 
-def generate_rand_letter():
+def generate_rand_letter(rng=np.random):
     """Generate a random letter."""
-    return np.random.choice(LETTERS)
+    return rng.choice(LETTERS)
     
     
 def score(s, other):
@@ -23,36 +33,356 @@ def score(s, other):
     return score
 
 
-def main():
-    """Simulation of the infinite monkey theorem."""
+def encode(s):
+    """Encode a string as a uint8 array of positions in LETTERS."""
+    
+    try:
+        return np.array([LETTER_CODES[c] for c in s], dtype=np.uint8)
+    except KeyError as e:
+        raise ValueError('Character {!r} is not in LETTERS'.format(e.args[0])) from None
+
+
+def decode(a):
+    """Decode a uint8 array of positions in LETTERS back into a string."""
+    return ''.join(np.array(LETTERS)[a])
+
 
-    counter = 0
-    best_str = None
-    best_score = 0
+def evolve(goal=GOAL, population=1000, rate=None, rng=None, verbose=True, report_every=100):
+    """Evolve a population of candidate strings towards the goal string.
+    
+    Every generation, each candidate is a copy of the best string so far with
+    random letters mutated, and the best candidate replaces it if it scores
+    higher. Candidates are rows of a 2-D uint8 array, and only the mutated
+    cells are rescored, so a generation costs time proportional to the number
+    of mutations rather than to population * len(goal).
+    
+    Parameters
+    ----------
+    population : int, default: 1000
+        Number of candidates per generation.
+    
+    rate : float, default: None
+        Probability of mutating each letter, 1 / len(goal) if None.
+    
+    rng : numpy.random.Generator, default: None
+    
+    Returns
+    -------
+    SearchResult with the final string, generations, trials (candidates
+    scored) and seconds elapsed.
+    """
     
-    while best_score < 1:
+    rng = rng or np.random.default_rng()
+    target = encode(goal)
+    n = len(target)
+    rate = 1 / n if rate is None else rate
+    
+    best = rng.integers(0, len(LETTERS), n, dtype=np.uint8)
+    correct = best == target
+    best_score = int(np.count_nonzero(correct))
+    candidates = np.tile(best, (population, 1))
+    generations = 0
+    
+    start = time.perf_counter()
+    
+    while best_score < n:
         
-        # Generate random string at first iteration
-        if best_str is None:
-            best_str = generate()
-        else:
-            # Find indices of incorrect letters
-            incorrect = [i for i in range(len(GOAL)) if best_str[i] != GOAL[i]]
-            # Modify one letter
-            best_str_ls = list(best_str)
-            best_str_ls[incorrect[0]] = generate_rand_letter()
-            best_str = ''.join(best_str_ls)
+        # Draw mutation counts per candidate, then (row, column) cells
+        counts = rng.binomial(n, rate, size=population)
+        rows = np.repeat(np.arange(population), counts)
+        cols = rng.integers(0, n, size=rows.size)
+        # Mutate each cell at most once so that score changes add up
+        cells = np.unique(rows * n + cols)
+        rows, cols = cells // n, cells % n
+        letters = rng.integers(0, len(LETTERS), size=rows.size, dtype=np.uint8)
+        candidates[rows, cols] = letters
+        
+        # Score change of each candidate from its mutated cells only
+        delta = (letters == target[cols]).astype(np.int64) - correct[cols]
+        scores = best_score + np.bincount(rows, weights=delta, minlength=population)
+        winner = int(scores.argmax())
+        
+        if scores[winner] > best_score:
+            changed = cols[rows == winner]
+            best[changed] = candidates[winner, changed]
+            correct[changed] = best[changed] == target[changed]
+            best_score = int(scores[winner])
+            # Carry the improvement over to every candidate
+            candidates[:, changed] = best[changed]
+        
+        # Undo the remaining mutations
+        candidates[rows, cols] = best[cols]
+        
+        generations += 1
+        if verbose and not generations % report_every:
+            print('Best string after {} trials : {}'.format(generations * population, decode(best)))
+            print('Score :', best_score / n)
+    
+    seconds = time.perf_counter() - start
+    trials = generations * population
+    
+    if verbose:
+        print('Generated goal string in {} trials ({:.0f} trials per second)'.format(
+            trials, trials / seconds if seconds else float('inf')))
+    
+    return SearchResult(decode(best), generations, trials, seconds)
+
+
+class IncrementalScorer:
+    """Score of a candidate string that is updated in O(1) per letter change.
+    
+    Keeps the candidate's letters, the number of matches with the goal and
+    the positions of incorrect letters, so strategies never rescan the
+    whole string after a mutation.
+    """
+    
+    def __init__(self, goal, candidate):
+        self.goal = goal
+        self.letters = list(candidate)
+        # Positions of incorrect letters, in no particular order
+        self.incorrect = []
+        # Index of each position in .incorrect, -1 if the letter is correct
+        self._index = [-1] * len(goal)
+        
+        for i, (c, g) in enumerate(zip(self.letters, goal)):
+            if c != g:
+                self._index[i] = len(self.incorrect)
+                self.incorrect.append(i)
+    
+    def __str__(self):
+        return ''.join(self.letters)
+    
+    @property
+    def matches(self):
+        return len(self.goal) - len(self.incorrect)
+    
+    def score(self):
+        """Return the fraction of correct letters."""
+        return self.matches / len(self.goal)
+    
+    def is_solved(self):
+        return not self.incorrect
+    
+    def delta(self, i, letter):
+        """Return the change in matches if position i were set to letter."""
+        return (letter == self.goal[i]) - (self.letters[i] == self.goal[i])
+    
+    def set(self, i, letter):
+        """Set position i to letter and update the score."""
+        
+        self.letters[i] = letter
+        index = self._index[i]
+        
+        if letter == self.goal[i]:
+            if index >= 0:
+                # Swap with the last incorrect position and pop
+                last = self.incorrect.pop()
+                if last != i:
+                    self.incorrect[index] = last
+                    self._index[last] = index
+                self._index[i] = -1
+        elif index < 0:
+            self._index[i] = len(self.incorrect)
+            self.incorrect.append(i)
+
+
+class HillClimb:
+    """Replace one incorrect letter with a random letter per trial."""
+    
+    def step(self, scorer, rng):
+        """Mutate the scorer's candidate and return the number of trials used."""
+        scorer.set(scorer.incorrect[0], generate_rand_letter(rng))
+        return 1
+
+
+class Weasel:
+    """Dawkins' weasel program: every generation, the best of a population
+    of mutated copies replaces the candidate unless it scores lower.
+    """
+    
+    def __init__(self, population=100, rate=0.05):
+        """
+        Parameters
+        ----------
+        population : int, default: 100
+            Number of copies per generation.
+        
+        rate : float, default: 0.05
+            Probability of mutating each letter of a copy.
+        """
+        self.population = population
+        self.rate = rate
+    
+    def step(self, scorer, rng):
         
-        # Compute score
-        best_score = score(best_str, GOAL)
+        n = len(scorer.goal)
+        best_delta = None
+        best_mutations = None
+        
+        for _ in range(self.population):
+            # Represent each copy by its mutations only
+            k = rng.binomial(n, self.rate)
+            positions = rng.integers(0, n, k).tolist()
+            letters = [LETTERS[j] for j in rng.integers(0, len(LETTERS), k)]
+            mutations = dict(zip(positions, letters))
+            
+            delta = sum(scorer.delta(i, c) for i, c in mutations.items())
+            if best_delta is None or delta > best_delta:
+                best_delta = delta
+                best_mutations = mutations
+        
+        if best_delta >= 0:
+            for i, c in best_mutations.items():
+                scorer.set(i, c)
+        
+        return self.population
+
+
+class RandomTyping:
+    """Pure infinite monkey: type a whole new random string every trial.
+    
+    Expect to need a trial limit for anything but very short goals.
+    """
+    
+    def step(self, scorer, rng):
+        for i, c in enumerate(generate(scorer.goal, rng)):
+            scorer.set(i, c)
+        return 1
+
+
+STRATEGIES = {'hill': HillClimb, 'weasel': Weasel, 'random': RandomTyping}
+
+
+def search(goal=GOAL, rng=None, verbose=True, strategy=None, max_trials=None):
+    """Simulation of the infinite monkey theorem.
+    
+    Parameters
+    ----------
+    rng : numpy.random.Generator, default: None
+    
+    verbose : bool, default: True
+        Whether to print progress every 1000 trials and the final result.
+    
+    strategy : HillClimb, Weasel or RandomTyping, default: None
+        How to mutate the candidate string, HillClimb() if None.
+    
+    max_trials : int, default: None
+        Give up after this many trials.
+    """
+    
+    rng = np.random.default_rng() if rng is None else rng
+    strategy = HillClimb() if strategy is None else strategy
+    
+    start = time.perf_counter()
+    
+    # Generate random string at first trial
+    scorer = IncrementalScorer(goal, generate(goal, rng))
+    counter = 1
+    generations = 1
+    
+    while not scorer.is_solved() and (max_trials is None or counter < max_trials):
+        
+        previous = counter
+        counter += strategy.step(scorer, rng)
+        generations += 1
         
         # Print progress
-        counter += 1
-        if not counter % 1000:
-            print('Best string after {} trials : {}'.format(counter, best_str))
-            print('Score :', best_score)
+        if verbose and counter // 1000 > previous // 1000:
+            print('Best string after {} trials : {}'.format(counter, scorer))
+            print('Score :', scorer.score())
+    
+    seconds = time.perf_counter() - start
+    
+    if verbose:
+        if scorer.is_solved():
+            print('Generated goal string "{}" in {} trials'.format(scorer, counter))
+        else:
+            print('Gave up after {} trials with "{}"'.format(counter, scorer))
+    
+    return SearchResult(str(scorer), generations, counter, seconds)
+
+
+def _seeded_search(args):
+    """Run a silent search with its own random stream, in a worker process."""
+    goal, seed, strategy, max_trials = args
+    return search(goal, np.random.default_rng(seed), False, strategy, max_trials)
+
+
+def run_searches(n_runs, seed=None, processes=None, goal=GOAL, strategy=None, max_trials=None):
+    """Run independent searches in parallel on a process pool.
+    
+    Each run draws from its own generator spawned from one SeedSequence, so
+    results for a given seed are reproducible whatever the number of
+    processes or the order in which workers pick up runs.
+    
+    Returns
+    -------
+    The list of SearchResults in run order and the wall time in seconds.
+    """
+    
+    seeds = np.random.SeedSequence(seed).spawn(n_runs)
+    processes = processes or os.cpu_count() or 1
+    # Batch runs to amortize inter-process communication
+    chunksize = max(1, n_runs // (4 * processes))
+    
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        results = list(executor.map(_seeded_search, [(goal, s, strategy, max_trials) for s in seeds],
+                                    chunksize=chunksize))
+    wall_seconds = time.perf_counter() - start
+    
+    return results, wall_seconds
+
+
+def summarize(results, wall_seconds=None):
+    """Return statistics of the trial counts and times of many searches."""
+    
+    trials = np.array([r.trials for r in results])
+    seconds = np.array([r.seconds for r in results])
+    
+    stats = {
+        'runs': len(results),
+        'mean_trials': trials.mean(),
+        'std_trials': trials.std(),
+        'min_trials': int(trials.min()),
+        'max_trials': int(trials.max()),
+        'mean_seconds': seconds.mean(),
+    }
+    for p in (5, 25, 50, 75, 95):
+        stats['p{}_trials'.format(p)] = np.percentile(trials, p)
+    if wall_seconds is not None:
+        stats['wall_seconds'] = wall_seconds
+    
+    return stats
+
+
+def main(argv=None):
+    
+    parser = argparse.ArgumentParser(description='Simulation of the infinite monkey theorem.')
+    parser.add_argument('--runs', type=int, default=1,
+                        help='number of independent searches; more than 1 runs them in parallel')
+    parser.add_argument('--seed', type=int, help='seed for reproducible runs')
+    parser.add_argument('--processes', type=int, help='worker processes (default: all cores)')
+    parser.add_argument('--goal', default=GOAL)
+    parser.add_argument('--strategy', choices=list(STRATEGIES), default='hill')
+    parser.add_argument('--population', type=int, default=100, help='weasel population')
+    parser.add_argument('--rate', type=float, default=0.05, help='weasel mutation rate')
+    parser.add_argument('--max-trials', type=int, help='give up after this many trials')
+    args = parser.parse_args(argv)
+    
+    if args.strategy == 'weasel':
+        strategy = Weasel(args.population, args.rate)
+    else:
+        strategy = STRATEGIES[args.strategy]()
+    
+    if args.runs == 1:
+        search(args.goal, np.random.default_rng(args.seed), True, strategy, args.max_trials)
+        return
     
-    print('Generated goal string "{}" in {} trials'.format(best_str, counter))
+    results, wall_seconds = run_searches(args.runs, args.seed, args.processes, args.goal,
+                                         strategy, args.max_trials)
+    for name, value in summarize(results, wall_seconds).items():
+        print('{:>14} : {:.6g}'.format(name, value))
 
 
 if __name__ == '__main__':
@@ -1,6 +1,12 @@
-import datetime
+import math
+import time
+from collections import namedtuple
+from functools import lru_cache
+
 import numpy as np
 
+from dlx import DancingLinks
+
 
 SAMPLE = np.array([[   7, None,    6, None, None,    1, None,    2,    8],
                    [None, None,    5, None,    3,    2,    9, None, None],
@@ -14,6 +20,11 @@ SAMPLE = np.array([[   7, None,    6, None, None,    1, None,    2,    8],
 
 NUMBERS = list(range(1, 10))
 
+# Work done by a solver: propagation passes over the board, candidates ruled
+# out, digits tried by search and guesses undone
+SolveStats = namedtuple('SolveStats', ['solved', 'time_ns', 'propagations', 'eliminations',
+                                       'guesses', 'backtracks'])
+
 
 def load_sample():
     """Load a sample Sudoku."""
@@ -123,44 +134,486 @@ class Sudoku:
         for c in self.empty_cells:
             self._update_cell_candidates(c.x, c.y)
     
+    def _current_array(self):
+        """Return cell values as an array with None for empty cells."""
+        return np.array([c.value for c in self.cells], dtype=object).reshape(9, 9)
+    
     def _update_array(self):
         """Update values in .array."""
         self.array = np.array([c.value for c in self.cells]).reshape(9, 9)
     
     def solve(self):
-        """Solve the Sudoku and print solution."""
+        """Solve the Sudoku and return a SolveStats.
         
-        start = datetime.datetime.now()
+        Cells with a single candidate are filled first; if that stalls, the
+        rest is solved by BitmaskSudoku, whose work is added to the totals.
+        Singles are also placed in the BitmaskSudoku masks, so two cells of a
+        unit left with the same single make the puzzle unsolvable.
+        """
+        
+        start = time.perf_counter_ns()
+        propagations = eliminations = guesses = backtracks = 0
+        solved = True
         
-        while self.empty_cells:
+        try:
+            engine = BitmaskSudoku(self._current_array())
+        except ValueError:
+            # Clues put the same digit twice in a unit
+            engine = None
+            solved = False
+        
+        while solved and self.empty_cells:
+            propagations += 1
             # Find all cells with only one candidate
-            one_cand_cells = [c for c in self.cells if len(c.candidates) == 1 and c in self.empty_cells]
+            one_cand_cells = [c for c in self.empty_cells if len(c.candidates) == 1]
             # If there is any, fill the cell and clear candidates
             if one_cand_cells:
                 for c in one_cand_cells:
-                    c.value = c.candidates.pop()
+                    i = 9 * c.x + c.y
+                    v = c.candidates.pop()
+                    # A peer filled in this pass already holds the digit
+                    if not engine.candidates(i) & (1 << (v - 1)):
+                        solved = False
+                        break
+                    engine.place(i, v)
+                    c.value = v
                 # After filling all cells, update empty cells and candidates
                 self.empty_cells = self._get_empty_cells()
+                before = sum(len(c.candidates) for c in self.empty_cells)
                 self._update_all_candidates()
+                eliminations += before - sum(len(c.candidates) for c in self.empty_cells)
             else:
-                print('No cells with only one candidate')
+                # Singles are not enough, finish with propagation and search
+                solved = engine.solve()
+                propagations += engine.propagations
+                eliminations += engine.eliminations
+                guesses += engine.guesses
+                backtracks += engine.backtracks
+                if solved:
+                    for c, v in zip(self.cells, engine.values):
+                        c.value = v
+                        c.candidates.clear()
+                    self.empty_cells = []
                 break
-        # If successfully solved
-        else:
-            end = datetime.datetime.now()
+        
+        if solved:
+            self._update_array()
+        
+        return SolveStats(solved, time.perf_counter_ns() - start, propagations, eliminations,
+                          guesses, backtracks)
+
+
+@lru_cache(maxsize=None)
+def _unit_tables(box):
+    """Return row, column and box index of every cell, the peers of every
+    cell (cells sharing a row, column or box) and the cells of every unit for
+    a board of box x box boxes.
+    """
+    
+    size = box * box
+    cells = range(size * size)
+    row_of = [i // size for i in cells]
+    col_of = [i % size for i in cells]
+    box_of = [(r // box) * box + c // box for r, c in zip(row_of, col_of)]
+    
+    peers = []
+    for i in cells:
+        peers.append(tuple(j for j in cells if j != i and (
+            row_of[j] == row_of[i] or col_of[j] == col_of[i] or box_of[j] == box_of[i])))
+    
+    # Cells of every row, column and box
+    units = ([[i for i in cells if row_of[i] == k] for k in range(size)]
+             + [[i for i in cells if col_of[i] == k] for k in range(size)]
+             + [[i for i in cells if box_of[i] == k] for k in range(size)])
+    
+    return row_of, col_of, box_of, peers, units
+
+
+class BitmaskSudoku:
+    """Sudoku engine storing constraints as bit masks.
+    
+    Bit v-1 of the mask of a row, column or box is set when digit v is
+    placed in it, so placing or removing a digit is O(1) and the candidates
+    of a cell are the complement of the OR of its three masks. Cells are
+    numbered row by row. Any N x N board with N a perfect square works.
+    """
+    
+    def __init__(self, a):
+        """
+        Parameters
+        ----------
+        a : NumPy array
+            Square board with None (or 0) for empty cells, like SAMPLE.
+        """
+        
+        a = np.asarray(a)
+        size = a.shape[0]
+        box = math.isqrt(size)
+        if a.shape != (size, size) or box * box != size:
+            raise ValueError('Board must be N x N with N a perfect square')
+        
+        self.array = a
+        self.size = size
+        self.box = box
+        self.all = (1 << size) - 1
+        self.row_of, self.col_of, self.box_of, self.peers, self.units = _unit_tables(box)
+        
+        self.values = [0] * (size * size)
+        self.rows = [0] * size
+        self.cols = [0] * size
+        self.boxes = [0] * size
+        # Candidates ruled out by deductions other than placed digits
+        self.excluded = [0] * (size * size)
+        # Placed cells (ints) and exclusions (cell, old mask) since the start
+        # of the search, undone on backtracking
+        self.trail = []
+        # Work done by the last solve()
+        self.propagations = self.eliminations = self.guesses = self.backtracks = 0
+        
+        for i, v in enumerate(a.ravel()):
+            if v is not None and v != 0:
+                v = int(v)
+                if not 1 <= v <= size or not self.candidates(i) & (1 << (v - 1)):
+                    raise ValueError('Invalid clue {} at cell {}'.format(v, divmod(i, size)))
+                self.place(i, v)
+    
+    def __repr__(self):
+        return 'BitmaskSudoku({})'.format(repr(self.to_array()))
+    
+    def __str__(self):
+        return str(self.to_array()).replace('None', '_')
+    
+    def candidates(self, i):
+        """Return the candidate mask of cell i."""
+        used = self.rows[self.row_of[i]] | self.cols[self.col_of[i]] | self.boxes[self.box_of[i]]
+        return self.all & ~(used | self.excluded[i])
+    
+    def place(self, i, v):
+        """Write digit v in cell i."""
+        
+        bit = 1 << (v - 1)
+        self.values[i] = v
+        self.rows[self.row_of[i]] |= bit
+        self.cols[self.col_of[i]] |= bit
+        self.boxes[self.box_of[i]] |= bit
+    
+    def remove(self, i):
+        """Clear cell i."""
+        
+        bit = ~(1 << (self.values[i] - 1))
+        self.values[i] = 0
+        self.rows[self.row_of[i]] &= bit
+        self.cols[self.col_of[i]] &= bit
+        self.boxes[self.box_of[i]] &= bit
+    
+    def empty_cells(self):
+        return [i for i, v in enumerate(self.values) if not v]
+    
+    def is_solved(self):
+        return all(self.values)
+    
+    def _assign(self, i, v):
+        """Place a digit and record it for undoing."""
+        
+        bit = 1 << (v - 1)
+        values, excluded = self.values, self.excluded
+        rows, cols, boxes = self.rows, self.cols, self.boxes
+        row_of, col_of, box_of = self.row_of, self.col_of, self.box_of
+        # The other candidates of the cell, and the digit in its empty peers
+        eliminated = self.candidates(i).bit_count() - 1
+        for p in self.peers[i]:
+            if not values[p] and not (rows[row_of[p]] | cols[col_of[p]] | boxes[box_of[p]]
+                                      | excluded[p]) & bit:
+                eliminated += 1
+        self.eliminations += eliminated
+        self.place(i, v)
+        self.trail.append(i)
+    
+    def _exclude(self, i, mask):
+        """Rule out candidates of cell i and record the change for undoing."""
+        self.eliminations += (self.candidates(i) & mask).bit_count()
+        self.trail.append((i, self.excluded[i]))
+        self.excluded[i] |= mask
+    
+    def _undo(self, mark):
+        """Undo placements and exclusions made since the trail had length mark."""
+        
+        while len(self.trail) > mark:
+            entry = self.trail.pop()
+            if isinstance(entry, int):
+                self.remove(entry)
+            else:
+                i, old = entry
+                self.excluded[i] = old
+    
+    def _hidden_singles(self, unit):
+        """Place digits that fit in only one cell of the unit.
+        
+        Return None on contradiction, otherwise whether anything was placed.
+        """
+        
+        once = twice = placed = 0
+        for i in unit:
+            if self.values[i]:
+                placed |= 1 << (self.values[i] - 1)
+            else:
+                cand = self.candidates(i)
+                twice |= once & cand
+                once |= cand
+        
+        # Some digit has nowhere to go
+        if once | placed != self.all:
+            return None
+        
+        hidden = once & ~twice
+        if not hidden:
+            return False
+        
+        for i in unit:
+            if not self.values[i]:
+                bits = self.candidates(i) & hidden
+                if bits:
+                    # Two digits can only go in this cell
+                    if bits & (bits - 1):
+                        return None
+                    self._assign(i, bits.bit_length())
+        
+        return True
+    
+    def _naked_pairs(self, unit):
+        """Remove the digits of two cells with the same two candidates from
+        the rest of the unit.
+        
+        Return None on contradiction, otherwise whether anything changed.
+        """
+        
+        pairs = {}
+        for i in unit:
+            if not self.values[i]:
+                cand = self.candidates(i)
+                if cand.bit_count() == 2:
+                    pairs.setdefault(cand, []).append(i)
+        
+        changed = False
+        for mask, cells in pairs.items():
+            # Three cells cannot share two digits
+            if len(cells) > 2:
+                return None
+            if len(cells) == 2:
+                for i in unit:
+                    if not self.values[i] and i not in cells and self.candidates(i) & mask:
+                        self._exclude(i, mask)
+                        changed = True
+        
+        return changed
+    
+    def propagate(self, naked_pairs=False):
+        """Apply naked singles, hidden singles and optionally naked pairs until
+        nothing changes. Return False on contradiction.
+        """
+        
+        changed = True
+        while changed:
+            changed = False
+            self.propagations += 1
             
-            print('Puzzle:')
-            print(self)
+            # Naked singles
+            for i in self.empty_cells():
+                cand = self.candidates(i)
+                if not cand:
+                    return False
+                if not cand & (cand - 1):
+                    self._assign(i, cand.bit_length())
+                    changed = True
             
-            print('Solved in {} seconds.'.format((end-start).microseconds / 1e6))
-            print('Solution:')
-            self._update_array()
-            print(self)
+            for unit in self.units:
+                result = self._hidden_singles(unit)
+                if result is None:
+                    return False
+                changed = changed or result
+            
+            if naked_pairs and not changed:
+                for unit in self.units:
+                    result = self._naked_pairs(unit)
+                    if result is None:
+                        return False
+                    changed = changed or result
+        
+        return True
+    
+    def _search(self, naked_pairs):
+        """Propagate, then guess digits for the cell with the fewest
+        candidates, undoing everything after a wrong guess.
+        """
+        
+        if not self.propagate(naked_pairs):
+            return False
+        
+        # Minimum remaining values: the cell with the fewest candidates...
+        best, best_count = None, self.size + 1
+        for i in self.empty_cells():
+            count = self.candidates(i).bit_count()
+            if count < best_count:
+                best, best_count = i, count
+        
+        if best is None:
+            return True
+        
+        choices = [(best, bit) for bit in self._bits(self.candidates(best))]
+        
+        # ...unless some digit fits in even fewer cells of a unit
+        if best_count > 2:
+            for unit in self.units:
+                cands = [(i, self.candidates(i)) for i in unit if not self.values[i]]
+                missing = 0
+                for _, cand in cands:
+                    missing |= cand
+                for bit in self._bits(missing):
+                    cells = [i for i, cand in cands if cand & bit]
+                    if len(cells) < len(choices):
+                        choices = [(i, bit) for i in cells]
+        
+        mark = len(self.trail)
+        for i, bit in choices:
+            self.guesses += 1
+            self._assign(i, bit.bit_length())
+            if self._search(naked_pairs):
+                return True
+            self.backtracks += 1
+            self._undo(mark)
+        
+        return False
+    
+    @staticmethod
+    def _bits(mask):
+        """Yield the set bits of a mask, lowest first."""
+        while mask:
+            bit = mask & -mask
+            yield bit
+            mask ^= bit
+    
+    def solve(self, naked_pairs=False):
+        """Solve the puzzle with constraint propagation and depth-first search.
+        
+        Return whether a solution was found; on failure the board is left as
+        given. The work done is counted in the propagations, eliminations,
+        guesses and backtracks attributes.
+        """
+        
+        self.trail = []
+        self.propagations = self.eliminations = self.guesses = self.backtracks = 0
+        if self._search(naked_pairs):
+            return True
+        
+        self._undo(0)
+        return False
+    
+    def to_array(self):
+        """Return the board as a NumPy array with None for empty cells."""
+        
+        values = [v if v else None for v in self.values]
+        if all(values):
+            return np.array(values).reshape(self.size, self.size)
+        return np.array(values, dtype=object).reshape(self.size, self.size)
+
+
+class DLXSudoku:
+    """Sudoku as an exact cover problem, solved with dancing links.
+    
+    Every (cell, digit) pair is a row covering four columns: the cell, and
+    the digit in its row, column and box. A solution picks one row per cell
+    so that every column is covered exactly once. Unlike BitmaskSudoku this
+    can enumerate and count every solution, which checks that a puzzle is
+    proper (has a unique solution).
+    """
+    
+    def __init__(self, a):
+        """
+        Parameters
+        ----------
+        a : NumPy array
+            Square board with None (or 0) for empty cells, like SAMPLE.
+        """
+        
+        # Validates the clues and gives the candidates of every empty cell
+        board = BitmaskSudoku(a)
+        self.size = size = board.size
+        self.values = list(board.values)
+        
+        n_cells = size * size
+        self.options = []
+        for i in range(n_cells):
+            if board.values[i]:
+                digits = [board.values[i]]
+            else:
+                digits = [bit.bit_length() for bit in board._bits(board.candidates(i))]
+            for v in digits:
+                d = v - 1
+                self.options.append((i, v, [i,
+                                            n_cells + board.row_of[i]*size + d,
+                                            2*n_cells + board.col_of[i]*size + d,
+                                            3*n_cells + board.box_of[i]*size + d]))
+        
+        self.links = DancingLinks(4 * n_cells, [columns for _, _, columns in self.options])
+    
+    def __repr__(self):
+        return 'DLXSudoku({})'.format(repr(self.to_array()))
+    
+    def __str__(self):
+        return str(self.to_array()).replace('None', '_')
+    
+    def solutions(self):
+        """Yield every solution as a NumPy array."""
+        
+        for rows in self.links.solutions():
+            values = [0] * (self.size * self.size)
+            for r in rows:
+                i, v, _ = self.options[r]
+                values[i] = v
+            yield np.array(values).reshape(self.size, self.size)
+    
+    def count_solutions(self, limit=None):
+        """Return the number of solutions, stopping early at limit."""
+        return self.links.count(limit)
+    
+    def is_unique(self):
+        """Return whether the puzzle has exactly one solution."""
+        return self.count_solutions(limit=2) == 1
+    
+    def solve(self):
+        """Fill in the first solution found and return whether there was one."""
+        
+        for solution in self.solutions():
+            self.values = solution.ravel().tolist()
+            return True
+        
+        return False
+    
+    def to_array(self):
+        """Return the board as a NumPy array with None for empty cells."""
+        
+        values = [v if v else None for v in self.values]
+        if all(values):
+            return np.array(values).reshape(self.size, self.size)
+        return np.array(values, dtype=object).reshape(self.size, self.size)
 
 
 def main():
     s = load_sample()
-    s.solve()
+    print('Puzzle:')
+    print(s)
+    
+    stats = s.solve()
+    if not stats.solved:
+        print('Puzzle has no solution')
+        return
+    
+    print('Solved in {:.6f} seconds ({} propagation passes, {} eliminations, '
+          '{} guesses, {} backtracks).'.format(stats.time_ns / 1e9, stats.propagations,
+                                               stats.eliminations, stats.guesses,
+                                               stats.backtracks))
+    print('Solution:')
+    print(s)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,253 @@
+"""Solve Sudoku puzzles in bulk with a process pool.
+
+Puzzles are read one per line, 81 characters row by row with '0' or '.' for
+empty cells. Lines are streamed, solved in chunks by worker processes and
+written back in input order, one solution per line, with an empty line for
+puzzles that are invalid or have no solution:
+
+    python sudoku_batch.py puzzles.txt --output solutions.txt --processes 4
+
+Throughput and per-puzzle latency percentiles are printed to stderr.
+"""
+
+import argparse
+import itertools
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from sudoku import BitmaskSudoku
+
+
+DIGITS = '123456789'
+
+PERCENTILES = [50, 90, 99, 99.9]
+
+
+def parse_puzzle(line):
+    """Convert an 81-character line to a 9 x 9 array with 0 for empty cells."""
+    
+    line = line.strip()
+    if len(line) != 81:
+        raise ValueError('Puzzle must have 81 characters, got {}'.format(len(line)))
+    
+    return np.array([DIGITS.index(ch) + 1 if ch in DIGITS else 0 for ch in line]).reshape(9, 9)
+
+
+def format_solution(a):
+    """Convert a solved 9 x 9 array to an 81-character line."""
+    return ''.join(str(v) for v in np.ravel(a))
+
+
+def read_puzzles(f):
+    """Yield puzzle lines from a file object, skipping blanks and # comments."""
+    
+    for line in f:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line
+
+
+def solve_line(line):
+    """Return the solution line of a puzzle line, or '' if there is none."""
+    
+    try:
+        engine = BitmaskSudoku(parse_puzzle(line))
+    except ValueError:
+        return ''
+    
+    return format_solution(engine.to_array()) if engine.solve() else ''
+
+
+def _solve_chunk(lines):
+    """Solve a chunk of puzzle lines in a worker process.
+    
+    Return a list of (solution line, latency in nanoseconds) pairs.
+    """
+    
+    results = []
+    for line in lines:
+        start = time.perf_counter_ns()
+        solution = solve_line(line)
+        results.append((solution, time.perf_counter_ns() - start))
+    
+    return results
+
+
+def _chunks(iterable, size):
+    """Yield lists of up to size consecutive items."""
+    
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def solve_stream(lines, processes=None, chunk_size=256, max_pending=None):
+    """Solve puzzle lines in worker processes and yield results in order.
+    
+    Parameters
+    ----------
+    lines : iterable of str
+        Puzzle lines, consumed lazily.
+    
+    processes : int, default: None
+        Number of worker processes, os.cpu_count() if None. With 1, puzzles
+        are solved in this process.
+    
+    chunk_size : int, default: 256
+        Puzzles sent to a worker at a time.
+    
+    max_pending : int, default: None
+        Chunks submitted but not yet yielded, 2 * processes if None. This
+        bounds memory use however long the input is.
+    
+    Yields
+    ------
+    (puzzle, solution, latency) tuples, with latency in nanoseconds and
+    solution '' for puzzles that are invalid or have no solution.
+    """
+    
+    chunks = _chunks(lines, chunk_size)
+    processes = processes or os.cpu_count()
+    if max_pending is None:
+        max_pending = 2 * processes
+    
+    if processes == 1:
+        for chunk in chunks:
+            for line, (solution, latency) in zip(chunk, _solve_chunk(chunk)):
+                yield line, solution, latency
+        return
+    
+    with ProcessPoolExecutor(processes) as executor:
+        # Futures in submission order, so the oldest one is always yielded first
+        pending = deque()
+        for chunk in chunks:
+            pending.append((chunk, executor.submit(_solve_chunk, chunk)))
+            if len(pending) >= max_pending:
+                yield from _drain(pending.popleft())
+        while pending:
+            yield from _drain(pending.popleft())
+
+
+def _drain(item):
+    """Yield the results of a submitted chunk, waiting for them if needed."""
+    
+    chunk, future = item
+    for line, (solution, latency) in zip(chunk, future.result()):
+        yield line, solution, latency
+
+
+class LatencyHistogram:
+    """Latencies counted in logarithmic buckets.
+    
+    Memory does not grow with the number of samples, and percentiles are
+    accurate to within the bucket ratio (1% by default).
+    """
+    
+    def __init__(self, ratio=1.01):
+        self.log_ratio = math.log(ratio)
+        self.counts = {}
+        self.n = 0
+        self.total = 0
+    
+    def add(self, ns):
+        """Record a latency in nanoseconds."""
+        
+        bucket = int(math.log(max(ns, 1)) / self.log_ratio)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.n += 1
+        self.total += ns
+    
+    def percentile(self, q):
+        """Return the qth percentile in nanoseconds, or None with no samples."""
+        
+        if not self.n:
+            return None
+        
+        rank = math.ceil(q / 100 * self.n)
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                # Upper edge of the bucket
+                return math.exp((bucket + 1) * self.log_ratio)
+        
+        return math.exp((max(self.counts) + 1) * self.log_ratio)
+    
+    def mean(self):
+        """Return the mean latency in nanoseconds, or None with no samples."""
+        return self.total / self.n if self.n else None
+
+
+def solve_file(infile, outfile, processes=None, chunk_size=256):
+    """Solve every puzzle in a file object and write solutions to another.
+    
+    Return a dict of statistics: puzzles solved and failed, wall time,
+    puzzles per second and latency percentiles in seconds.
+    """
+    
+    histogram = LatencyHistogram()
+    solved = failed = 0
+    
+    start = time.perf_counter()
+    for _, solution, latency in solve_stream(read_puzzles(infile), processes, chunk_size):
+        outfile.write(solution + '\n')
+        histogram.add(latency)
+        if solution:
+            solved += 1
+        else:
+            failed += 1
+    seconds = time.perf_counter() - start
+    
+    stats = {'puzzles': solved + failed,
+             'solved': solved,
+             'failed': failed,
+             'seconds': seconds,
+             'puzzles_per_second': (solved + failed) / seconds if seconds else 0.0,
+             'mean_latency': histogram.mean() / 1e9 if histogram.n else None}
+    for q in PERCENTILES:
+        p = histogram.percentile(q)
+        stats['p{:g}'.format(q)] = p / 1e9 if p is not None else None
+    
+    return stats
+
+
+def main(argv=None):
+    
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('input', help="puzzle file, or '-' for stdin")
+    parser.add_argument('--output', help='file to write solutions to (default: stdout)')
+    parser.add_argument('--processes', type=int, help='worker processes (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=256, help='puzzles per task')
+    args = parser.parse_args(argv)
+    
+    infile = sys.stdin if args.input == '-' else open(args.input)
+    outfile = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        stats = solve_file(infile, outfile, args.processes, args.chunk_size)
+    finally:
+        if args.input != '-':
+            infile.close()
+        if args.output:
+            outfile.close()
+    
+    print('{puzzles} puzzles ({solved} solved, {failed} failed) in {seconds:.3f}s, '
+          '{puzzles_per_second:.1f} puzzles/s'.format(**stats), file=sys.stderr)
+    if stats['puzzles']:
+        print('Latency: mean {:.3g}s, '.format(stats['mean_latency'])
+              + ', '.join('p{:g} {:.3g}s'.format(q, stats['p{:g}'.format(q)]) for q in PERCENTILES),
+              file=sys.stderr)
+    
+    return 0 if not stats['failed'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,254 @@
+import heapq
+import math
+import random
+
+import numpy as np
+
+
+# Largest k for which kth_smallest() streams through a heap instead of
+# selecting from a list
+HEAP_MAX_K = 64
+
+
+def stream_min(iterable, key=None):
+    """Return the minimum of an iterable in a single pass.
+    
+    Unlike find_min_linear, works on any iterable, including generators too
+    large to hold in memory. Raise ValueError if it is empty.
+    """
+    
+    iterator = iter(iterable)
+    try:
+        m = next(iterator)
+    except StopIteration:
+        raise ValueError('stream_min() of an empty iterable') from None
+    
+    if key is None:
+        for x in iterator:
+            if x < m:
+                m = x
+    else:
+        mk = key(m)
+        for x in iterator:
+            xk = key(x)
+            if xk < mk:
+                m, mk = x, xk
+    
+    return m
+
+
+def stream_max(iterable, key=None):
+    """Return the maximum of an iterable in a single pass."""
+    
+    iterator = iter(iterable)
+    try:
+        m = next(iterator)
+    except StopIteration:
+        raise ValueError('stream_max() of an empty iterable') from None
+    
+    if key is None:
+        for x in iterator:
+            if m < x:
+                m = x
+    else:
+        mk = key(m)
+        for x in iterator:
+            xk = key(x)
+            if mk < xk:
+                m, mk = x, xk
+    
+    return m
+
+
+def stream_minmax(iterable):
+    """Return (minimum, maximum) of an iterable in a single pass.
+    
+    Items are taken in pairs: the smaller one is compared to the minimum and
+    the larger one to the maximum, which makes 3 comparisons per 2 items
+    instead of 4.
+    """
+    
+    iterator = iter(iterable)
+    try:
+        lo = hi = next(iterator)
+    except StopIteration:
+        raise ValueError('stream_minmax() of an empty iterable') from None
+    
+    for x in iterator:
+        y = next(iterator, x)
+        if y < x:
+            x, y = y, x
+        if x < lo:
+            lo = x
+        if hi < y:
+            hi = y
+    
+    return lo, hi
+
+
+def iter_chunks(a, chunk_size=1 << 20):
+    """Yield consecutive slices of an array, e.g. a memory-mapped one, of at
+    most chunk_size elements along the first axis.
+    """
+    
+    for start in range(0, len(a), chunk_size):
+        yield a[start:start + chunk_size]
+
+
+def chunked_minmax(chunks):
+    """Return (minimum, maximum) over an iterable of NumPy arrays.
+    
+    Each chunk is reduced with vectorized np.min and np.max, so only one
+    chunk has to be in memory at a time.
+    """
+    
+    lo = hi = None
+    for chunk in chunks:
+        chunk = np.asarray(chunk)
+        if chunk.size == 0:
+            continue
+        c_lo, c_hi = chunk.min(), chunk.max()
+        if lo is None:
+            lo, hi = c_lo, c_hi
+        else:
+            lo, hi = min(lo, c_lo), max(hi, c_hi)
+    
+    if lo is None:
+        raise ValueError('chunked_minmax() of empty chunks')
+    
+    return lo, hi
+
+
+def top_k(iterable, k, largest=False, key=None):
+    """Return the k smallest (or largest) items of an iterable, sorted.
+    
+    A heap of the best k items so far is kept while streaming, so this takes
+    O(n log k) time and O(k) memory.
+    """
+    
+    if largest:
+        return heapq.nlargest(k, iterable, key=key)
+    return heapq.nsmallest(k, iterable, key=key)
+
+
+def _check_k(a, k):
+    if not 1 <= k <= len(a):
+        raise ValueError('k must be between 1 and {}, got {}'.format(len(a), k))
+
+
+def _median_of_medians(a):
+    """Return a pivot from a with at least 30% of the items on either side:
+    the median of the medians of groups of 5.
+    """
+    
+    medians = []
+    for start in range(0, len(a), 5):
+        group = sorted(a[start:start + 5])
+        medians.append(group[(len(group) - 1) // 2])
+    
+    if len(medians) <= 5:
+        return sorted(medians)[(len(medians) - 1) // 2]
+    return _select(medians, (len(medians) - 1) // 2, 'median_of_medians')
+
+
+def _select(a, index, method, rng=random):
+    """Return the item that would be at a[index] if list a were sorted.
+    
+    The pivot is random for 'quickselect' and the median of medians for
+    'median_of_medians'. 'introselect' starts with random pivots and switches
+    to the median of medians once too many partitions have failed to halve
+    the range.
+    
+    Partitioning builds new lists with comprehensions rather than swapping
+    in place, which is several times faster in CPython. Items equal to the
+    pivot are never copied, so duplicates cannot make selection quadratic.
+    """
+    
+    # Bad partitions allowed before introselect gives up on random pivots
+    budget = 2 * math.ceil(math.log2(len(a))) if len(a) > 1 else 0
+    
+    while len(a) > 1:
+        if method == 'median_of_medians' or (method == 'introselect' and budget <= 0):
+            pivot = _median_of_medians(a)
+        else:
+            pivot = a[rng.randrange(len(a))]
+        
+        size = len(a)
+        lows = [x for x in a if x < pivot]
+        if index < len(lows):
+            a = lows
+        else:
+            highs = [x for x in a if pivot < x]
+            n_equal = size - len(lows) - len(highs)
+            if index < len(lows) + n_equal:
+                return pivot
+            index -= len(lows) + n_equal
+            a = highs
+        
+        if len(a) > size // 2:
+            budget -= 1
+    
+    return a[0]
+
+
+def quickselect(data, k, rng=random):
+    """Return the kth smallest item (k = 1 is the minimum) in O(n) expected
+    time, with random pivots.
+    """
+    
+    a = list(data)
+    _check_k(a, k)
+    return _select(a, k - 1, 'quickselect', rng)
+
+
+def median_of_medians(data, k):
+    """Return the kth smallest item in O(n) worst-case time.
+    
+    Slower than quickselect on average, but immune to adversarial inputs.
+    """
+    
+    a = list(data)
+    _check_k(a, k)
+    return _select(a, k - 1, 'median_of_medians')
+
+
+def introselect(data, k, rng=random):
+    """Return the kth smallest item with quickselect, falling back to
+    median-of-medians pivots when partitions keep coming out unbalanced, for
+    O(n) expected time and O(n) worst case.
+    """
+    
+    a = list(data)
+    _check_k(a, k)
+    return _select(a, k - 1, 'introselect', rng)
+
+
+def kth_smallest(data, k):
+    """Return the kth smallest item, k = 1 being the minimum.
+    
+    NumPy arrays are handled by np.partition, which runs introselect in C.
+    For small k, other iterables are streamed through a heap of k items, so
+    they need not fit in memory; otherwise they go to introselect().
+    """
+    
+    if isinstance(data, np.ndarray):
+        a = data.ravel()
+        _check_k(a, k)
+        return np.partition(a, k - 1)[k - 1]
+    
+    if 1 <= k <= HEAP_MAX_K:
+        smallest = top_k(data, k)
+        _check_k(smallest, k)
+        return smallest[-1]
+    
+    return introselect(data, k)
+
+
+def median(data):
+    """Return the lower median of the items in O(n) time."""
+    
+    a = list(data)
+    if not a:
+        raise ValueError('median() of empty data')
+    
+    return _select(a, (len(a) - 1) // 2, 'introselect')
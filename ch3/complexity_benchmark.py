@@ -0,0 +1,297 @@
+"""Measure how the cost of data structure operations grows with size.
+
+Runs the timing experiments of the ch2 and ch3 notebooks (lists,
+dictionaries, stacks, queues and linked lists) as a script. Every operation
+is timed at several sizes, taking the median of repeated runs after warmup.
+A line is then fitted to log(time) against log(size): its slope is the
+empirical exponent, about 0 for O(1) and 1 for O(n) operations. Results are
+written as JSON, optionally plotted, and can be checked against the expected
+exponents:
+    
+    python complexity_benchmark.py --output results.json --plot results.png
+    python complexity_benchmark.py --experiments linked_list_append --check
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import timeit
+from collections import namedtuple
+
+import numpy as np
+
+from linear_data_structure import Stack, Queue, EndRearQueue
+from linear_data_structure_ll import Stack as LinkedStack
+from linear_data_structure_ll import Queue as LinkedQueue
+from list_ import UnorderedList
+
+
+# setup(n, number) builds a structure of size n and returns a zero-argument
+# callable doing the operation once, which must stay valid for number calls.
+# expected is the exponent of n in the documented complexity, and number
+# overrides the calls per timing run for slow operations.
+Experiment = namedtuple('Experiment', ['setup', 'expected', 'description', 'number'],
+                        defaults=[None])
+
+
+def _linked_list(n):
+    """Return an UnorderedList of n items, built in O(n) by adding at the head."""
+    
+    ls = UnorderedList()
+    for x in range(n):
+        ls.add(x)
+    
+    return ls
+
+
+def _list_index(n, number):
+    ls = list(range(n))
+    return lambda: ls[0]
+
+
+def _dict_get(n, number):
+    d = dict.fromkeys(range(n))
+    return lambda: d[0]
+
+
+def _dict_set(n, number):
+    d = dict.fromkeys(range(n))
+    
+    def op():
+        d[0] = 0
+    
+    return op
+
+
+def _list_del(n, number):
+    # Extra items so the size stays n however many are deleted
+    x = list(range(n + number))
+    keys = iter(range(number))
+    
+    def op():
+        del x[next(keys)]
+    
+    return op
+
+
+def _dict_del(n, number):
+    x = dict.fromkeys(range(n + number))
+    keys = iter(range(number))
+    
+    def op():
+        del x[next(keys)]
+    
+    return op
+
+
+def _kth_smallest_sort(n, number):
+    ls = list(range(n))
+    random.Random(0).shuffle(ls)
+    return lambda: sorted(ls)[2]
+
+
+def _list_append(n, number):
+    ls = list(range(n))
+    return lambda: ls.append(0)
+
+
+def _linked_list_append(n, number):
+    ls = _linked_list(n)
+    return lambda: ls.append(0)
+
+
+def _stack_push(n, number):
+    stack = Stack()
+    stack.items = list(range(n))
+    return lambda: stack.push(0)
+
+
+def _linked_stack_push(n, number):
+    stack = LinkedStack()
+    for x in range(n):
+        stack.push(x)
+    return lambda: stack.push(0)
+
+
+def _queue_enqueue(n, number):
+    q = Queue()
+    q.items = list(range(n))
+    return lambda: q.enqueue(0)
+
+
+def _end_rear_queue_enqueue(n, number):
+    q = EndRearQueue()
+    q.items = list(range(n))
+    return lambda: q.enqueue(0)
+
+
+def _queue_dequeue(n, number):
+    q = Queue()
+    q.items = list(range(n + number))
+    return q.dequeue
+
+
+def _end_rear_queue_dequeue(n, number):
+    q = EndRearQueue()
+    q.items = list(range(n + number))
+    return q.dequeue
+
+
+def _linked_queue(n):
+    q = LinkedQueue()
+    for x in range(n):
+        q.enqueue(x)
+    return q
+
+
+def _linked_queue_enqueue(n, number):
+    q = _linked_queue(n)
+    return lambda: q.enqueue(0)
+
+
+def _linked_queue_dequeue(n, number):
+    return _linked_queue(n + number).dequeue
+
+
+EXPERIMENTS = {
+    'list_index': Experiment(_list_index, 0, 'List index operator'),
+    'dict_get': Experiment(_dict_get, 0, 'Dictionary get item'),
+    'dict_set': Experiment(_dict_set, 0, 'Dictionary set item'),
+    'list_del': Experiment(_list_del, 1, 'del near the start of a list'),
+    'dict_del': Experiment(_dict_del, 0, 'del on a dictionary'),
+    'kth_smallest_sort': Experiment(_kth_smallest_sort, 1,
+                                    'kth smallest number by sorting (O(n log n))', 10),
+    'list_append': Experiment(_list_append, 0, 'Python list append'),
+    'linked_list_append': Experiment(_linked_list_append, 0, 'Linked list append'),
+    'stack_push': Experiment(_stack_push, 0, 'Python list based stack push'),
+    'linked_stack_push': Experiment(_linked_stack_push, 0, 'Linked list based stack push'),
+    'queue_enqueue': Experiment(_queue_enqueue, 1, 'Enqueue, rear at position 0'),
+    'end_rear_queue_enqueue': Experiment(_end_rear_queue_enqueue, 0, 'Enqueue, rear at end'),
+    'queue_dequeue': Experiment(_queue_dequeue, 0, 'Dequeue, rear at position 0'),
+    'end_rear_queue_dequeue': Experiment(_end_rear_queue_dequeue, 1, 'Dequeue, rear at end'),
+    'linked_queue_enqueue': Experiment(_linked_queue_enqueue, 0, 'Linked list based enqueue'),
+    'linked_queue_dequeue': Experiment(_linked_queue_dequeue, 0, 'Linked list based dequeue'),
+}
+
+SIZES = [1000, 2000, 4000, 8000, 16000, 32000]
+
+
+def time_operation(experiment, n, number=100, repeat=5, warmup=1):
+    """Return the median time of one operation at size n, in seconds.
+    
+    Every run times number calls on a freshly built structure, so operations
+    that grow or shrink the structure start from the same size each time.
+    The first warmup runs are discarded.
+    """
+    
+    number = experiment.number or number
+    times = []
+    for i in range(warmup + repeat):
+        op = experiment.setup(n, number)
+        t = timeit.Timer(op).timeit(number=number)
+        if i >= warmup:
+            times.append(t / number)
+    
+    return statistics.median(times)
+
+
+def fit_exponent(sizes, seconds):
+    """Return the slope of the least squares line through (log n, log t)."""
+    
+    slope, _ = np.polyfit(np.log(sizes), np.log(seconds), 1)
+    return float(slope)
+
+
+def run(experiments=None, sizes=None, number=100, repeat=5, warmup=1):
+    """Time every experiment at every size and return a dict of results by
+    experiment name.
+    """
+    
+    experiments = experiments or list(EXPERIMENTS)
+    sizes = sizes or SIZES
+    
+    results = {}
+    for name in experiments:
+        experiment = EXPERIMENTS[name]
+        seconds = [time_operation(experiment, n, number, repeat, warmup) for n in sizes]
+        results[name] = {'description': experiment.description,
+                         'sizes': list(sizes),
+                         'seconds': seconds,
+                         'exponent': fit_exponent(sizes, seconds),
+                         'expected': experiment.expected}
+    
+    return results
+
+
+def find_regressions(results, tolerance=0.5):
+    """Return the names of experiments whose fitted exponent exceeds the
+    expected one by more than tolerance.
+    """
+    return [name for name, r in results.items() if r['exponent'] > r['expected'] + tolerance]
+
+
+def plot(results, path):
+    """Plot time against size on log-log axes and save the figure to path."""
+    
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    
+    fig, ax = plt.subplots(figsize=(9, 6))
+    for name, r in results.items():
+        ax.loglog(r['sizes'], r['seconds'], marker='.',
+                  label='{} (slope {:.2f})'.format(name, r['exponent']))
+    
+    ax.set_xlabel('Size')
+    ax.set_ylabel('Time per operation (seconds)')
+    ax.legend(fontsize='small')
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+
+
+def main(argv=None):
+    
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', help='JSON file to write results to (default: stdout)')
+    parser.add_argument('--plot', help='image file to save a log-log plot to (needs matplotlib)')
+    parser.add_argument('--experiments', nargs='+', choices=list(EXPERIMENTS))
+    parser.add_argument('--sizes', nargs='+', type=int)
+    parser.add_argument('--number', type=int, default=100, help='calls per timing run')
+    parser.add_argument('--repeat', type=int, default=5, help='timing runs, median is kept')
+    parser.add_argument('--warmup', type=int, default=1, help='untimed runs before timing')
+    parser.add_argument('--check', action='store_true',
+                        help='fail if an exponent exceeds the expected one by more than tolerance')
+    parser.add_argument('--tolerance', type=float, default=0.5)
+    args = parser.parse_args(argv)
+    
+    if args.sizes and len(args.sizes) < 2:
+        parser.error('at least two sizes are needed to fit an exponent')
+    
+    results = run(args.experiments, args.sizes, args.number, args.repeat, args.warmup)
+    
+    f = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        json.dump(results, f, indent=2)
+        f.write('\n')
+    finally:
+        if args.output:
+            f.close()
+    
+    if args.plot:
+        plot(results, args.plot)
+    
+    if args.check:
+        regressions = find_regressions(results, args.tolerance)
+        for name in regressions:
+            print('Regression: {} grows as n^{:.2f}, expected n^{}'.format(
+                name, results[name]['exponent'], results[name]['expected']), file=sys.stderr)
+        return 1 if regressions else 0
+    
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,11 +1,15 @@
-from list_ import UnorderedList
+from list_ import DoublyLinkedList
 
 
 class Stack:
-    """Implementation of the stack abstract data type using linked lists."""
+    """Implementation of the stack abstract data type using linked lists.
+    
+    The top of the stack is the end of a doubly linked list, so every
+    operation is O(1).
+    """
     
     def __init__(self):
-        self.items = UnorderedList()
+        self.items = DoublyLinkedList()
     
     def is_empty(self):
         return self.items.is_empty()
@@ -17,31 +21,27 @@ class Stack:
         return self.items.pop()
     
     def peek(self):
-        
-        previous = None
-        current = self.items.head
-        
-        while current is not None:
-            previous = current
-            current = current.get_next()
-        
-        return previous.get_data()
+        return self.items.get_last()
     
     def size(self):
         return self.items.length()
 
 
 class Queue:
-    """Implementation of the queue abstract data type using linked lists."""
+    """Implementation of the queue abstract data type using linked lists.
+    
+    The rear is at position 0 of a doubly linked list, so enqueue and dequeue
+    are O(1).
+    """
     
     def __init__(self):
-        self.items = UnorderedList()
+        self.items = DoublyLinkedList()
     
     def is_empty(self):
         return self.items.is_empty()
     
     def enqueue(self, item):
-        self.items.insert(0, item)
+        self.items.add(item)
     
     def dequeue(self):
         return self.items.pop()
@@ -52,11 +52,11 @@ class Queue:
 
 class Deque:
     """Implementation of the deque abstract data type using linked lists, where
-    the rear of the deque is at position 0.
+    the rear of the deque is at position 0. Every operation is O(1).
     """
     
     def __init__(self):
-        self.items = UnorderedList()
+        self.items = DoublyLinkedList()
     
     def is_empty(self):
         return self.items.is_empty()
@@ -65,7 +65,7 @@ class Deque:
         self.items.append(item)
     
     def add_rear(self, item):
-        self.items.insert(0, item)
+        self.items.add(item)
     
     def remove_front(self):
         return self.items.pop()
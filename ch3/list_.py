@@ -1,6 +1,9 @@
 class Node:
     """Building block for the linked list implementation."""
     
+    # No per-instance __dict__, which cuts the size of a node by more than half
+    __slots__ = ('data', 'next')
+    
     def __init__(self, data):
         self.data = data
         self.next = None
@@ -18,34 +21,65 @@ class Node:
         self.next = node
 
 
+class DoublyNode(Node):
+    """Node of a doubly linked list, which also links to the previous node."""
+    
+    __slots__ = ('prev',)
+    
+    def __init__(self, data):
+        super().__init__(data)
+        self.prev = None
+    
+    def get_prev(self):
+        return self.prev
+    
+    def set_prev(self, node):
+        self.prev = node
+
+
 class LinkedList:
-    """Implementation of the linked list abstract data type."""
+    """Implementation of the linked list abstract data type.
     
-    def __init__(self):
+    Besides the head, the list keeps a reference to its last node and its
+    number of items, so appending and getting the length are O(1).
+    """
+    
+    def __init__(self, iterable=None):
         self.head = None
+        self.tail = None
+        self._size = 0
+        
+        if iterable is not None:
+            self.extend(iterable)
+    
+    @classmethod
+    def from_iterable(cls, iterable):
+        """Create a list holding the items of an iterable."""
+        return cls(iterable)
     
     def is_empty(self):
         return self.head is None
     
-    def __str__(self):
-        
-        items = ''
+    def __iter__(self):
         current = self.head
-        
         while current is not None:
-            items += str(current.get_data()) + ', '
-            current = current.get_next()
-        
-        return '[{}]'.format(items[:-2])
+            yield current.data
+            current = current.next
+    
+    def __contains__(self, item):
+        for data in self:
+            if data == item:
+                return True
+        return False
+    
+    def __str__(self):
+        return '[{}]'.format(', '.join(str(data) for data in self))
     
     def length(self):
-        count = 0
-        current = self.head
-        while current is not None:
-            count += 1
-            current = current.get_next()
-        
-        return count
+        return self._size
+    
+    def __len__(self):
+        return self._size
     
     def pop(self, pos=None):
         """Remove and return the item at position pos. If pos=None, remove and
@@ -56,9 +90,12 @@ class LinkedList:
             raise IndexError('pop from empty list')
         
         if pos is None:
-            pos = self.length() - 1
+            pos = self._size - 1
+        
+        elif pos < 0:
+            pos += self._size
         
-        elif pos >= self.length():
+        if not 0 <= pos < self._size:
             raise IndexError('pop index out of range')
         
         previous = None
@@ -68,13 +105,36 @@ class LinkedList:
             previous = current
             current = current.get_next()
         
+        self._unlink(previous, current)
+        
+        return current.get_data()
+    
+    def _unlink(self, previous, current):
+        """Remove node current, which follows node previous (None for the head)."""
+        
         # If the item to be removed is the first item
-        if pos == 0:
+        if previous is None:
             self.head = current.get_next()
         else:
             previous.set_next(current.get_next())
         
-        return current.get_data()
+        if current is self.tail:
+            self.tail = previous
+        self._size -= 1
+    
+    def _link_after(self, previous, n):
+        """Insert node n after node previous (None for the head)."""
+        
+        if previous is None:
+            n.set_next(self.head)
+            self.head = n
+        else:
+            n.set_next(previous.get_next())
+            previous.set_next(n)
+        
+        if n.get_next() is None:
+            self.tail = n
+        self._size += 1
 
 
 class UnorderedList(LinkedList):
@@ -83,9 +143,7 @@ class UnorderedList(LinkedList):
     def add(self, item):
         """Add a new item to the beginning of the list."""
         
-        n = Node(item)
-        n.set_next(self.head)
-        self.head = n
+        self._link_after(None, Node(item))
     
     def search(self, item):
         """Search for the item in the list and returns a boolean value."""
@@ -111,11 +169,7 @@ class UnorderedList(LinkedList):
         while current is not None:
             
             if current.get_data() == item:
-                # If the item to be removed is the first item
-                if previous is None:
-                    self.head = current.get_next()
-                else:
-                    previous.set_next(current.get_next())
+                self._unlink(previous, current)
                 return
             
             else:
@@ -140,52 +194,72 @@ class UnorderedList(LinkedList):
     def append(self, item):
         """Add a new item to the end of the list."""
         
-        n = Node(item)
-        current = self.head
-        
-        # Special case - empty list
-        if current is None:
-            self.head = n
-        else:
-            # Find the last node
-            while current.get_next() is not None:
-                current = current.get_next()
-            current.set_next(n)
+        self._link_after(self.tail, Node(item))
     
     def insert(self, pos, item):
         """Add a new item to the list at position pos."""
         
-        if pos == 0:
+        if pos <= 0:
             self.add(item)
         
-        elif pos >= self.length():
+        elif pos >= self._size:
             self.append(item)
         
         else:
-            previous = None
-            current = self.head
+            previous = self.head
             
-            for _ in range(pos):
-                previous = current
-                current = current.get_next()
+            for _ in range(pos - 1):
+                previous = previous.get_next()
             
+            self._link_after(previous, Node(item))
+    
+    def extend(self, iterable):
+        """Add the items of an iterable to the end of the list, linking the
+        new nodes in one pass.
+        """
+        
+        if iterable is self:
+            iterable = list(self)
+        
+        previous = self.tail
+        count = 0
+        
+        for item in iterable:
             n = Node(item)
-            previous.set_next(n)
-            n.set_next(current)
+            if previous is None:
+                self.head = n
+            else:
+                previous.next = n
+            previous = n
+            count += 1
+        
+        self.tail = previous
+        self._size += count
     
     def slice_(self, start, stop):
         """Return a copy of the list starting at the start position and going
-        up to but not including the stop position.
+        up to but not including the stop position, in O(stop) time.
         """
         
         sl = UnorderedList()
+        start = max(start, 0)
+        stop = min(stop, self._size)
+        if start >= stop:
+            return sl
         
         current = self.head
+        for _ in range(start):
+            current = current.next
         
-        for i in range(min(stop, self.length())):
-            if i >= start:
-                sl.append(current.get_data())
-            current = current.get_next()
+        # Copy the nodes as a chain, then attach it to the new list at once
+        head = previous = Node(current.data)
+        for _ in range(stop - start - 1):
+            current = current.next
+            n = Node(current.data)
+            previous.next = n
+            previous = n
+        
+        sl.head, sl.tail, sl._size = head, previous, stop - start
         
         return sl
 
@@ -210,14 +284,9 @@ class OrderedList(LinkedList):
                 previous = current
                 current = current.get_next()
         
-        n = Node(item)
-        # If node is to be added at the beginning (incl. case of empty list)
-        if previous is None:
-            n.set_next(self.head)
-            self.head = n
-        else:
-            previous.set_next(n)
-            n.set_next(current)
+        # previous is None if node is to be added at the beginning (incl. case
+        # of empty list)
+        self._link_after(previous, Node(item))
     
     def search(self, item):
         """Search for the item in the list."""
@@ -235,6 +304,38 @@ class OrderedList(LinkedList):
         
         return False
     
+    __contains__ = search
+    
+    def extend(self, iterable):
+        """Add the items of an iterable making sure that the order is
+        preserved.
+        
+        The new items are sorted and then merged into the list in a single
+        pass, in O(n + k log k) time for k new items instead of O(nk).
+        """
+        
+        items = sorted(iterable)
+        previous = None
+        current = self.head
+        
+        for item in items:
+            # Equal items go after existing ones, like add()
+            while current is not None and not current.data > item:
+                previous = current
+                current = current.next
+            
+            n = Node(item)
+            n.next = current
+            if previous is None:
+                self.head = n
+            else:
+                previous.next = n
+            if current is None:
+                self.tail = n
+            previous = n
+        
+        self._size += len(items)
+    
     def remove(self, item):
         """Remove the item from the list. Do nothing if the item is not
         in the list.
@@ -246,11 +347,7 @@ class OrderedList(LinkedList):
         while current is not None:
             
             if current.get_data() == item:
-                # If the item to be removed is the first item
-                if previous is None:
-                    self.head = current.get_next()
-                else:
-                    previous.set_next(current.get_next())
+                self._unlink(previous, current)
                 return
             
             # Early stop
@@ -277,4 +374,167 @@ class OrderedList(LinkedList):
                 current = current.get_next()
                 pos += 1
         
-        raise ValueError('{} is not in list'.format(item))
\ No newline at end of file
+        raise ValueError('{} is not in list'.format(item))
+
+
+class DoublyLinkedList:
+    """Implementation of the unordered list abstract data type with a doubly
+    linked list.
+    
+    Every node links to both its neighbours, and the list is bracketed by two
+    sentinel nodes holding no data, so adding or removing at either end is
+    O(1) and needs no special case for the empty list.
+    """
+    
+    def __init__(self):
+        self.head = DoublyNode(None)
+        self.tail = DoublyNode(None)
+        self.head.set_next(self.tail)
+        self.tail.set_prev(self.head)
+        self._size = 0
+    
+    def is_empty(self):
+        return self._size == 0
+    
+    def __str__(self):
+        
+        items = []
+        current = self.head.get_next()
+        
+        while current is not self.tail:
+            items.append(str(current.get_data()))
+            current = current.get_next()
+        
+        return '[{}]'.format(', '.join(items))
+    
+    def length(self):
+        return self._size
+    
+    def __len__(self):
+        return self._size
+    
+    def _link_after(self, previous, item):
+        """Insert a new node holding item after node previous."""
+        
+        n = DoublyNode(item)
+        following = previous.get_next()
+        n.set_prev(previous)
+        n.set_next(following)
+        previous.set_next(n)
+        following.set_prev(n)
+        self._size += 1
+    
+    def _unlink(self, current):
+        """Remove node current and return its item."""
+        
+        current.get_prev().set_next(current.get_next())
+        current.get_next().set_prev(current.get_prev())
+        self._size -= 1
+        
+        return current.get_data()
+    
+    def _node_at(self, pos):
+        """Return the node at position pos, walking from the nearer end."""
+        
+        if pos < self._size // 2:
+            current = self.head.get_next()
+            for _ in range(pos):
+                current = current.get_next()
+        else:
+            current = self.tail.get_prev()
+            for _ in range(self._size - 1 - pos):
+                current = current.get_prev()
+        
+        return current
+    
+    def add(self, item):
+        """Add a new item to the beginning of the list."""
+        self._link_after(self.head, item)
+    
+    def append(self, item):
+        """Add a new item to the end of the list."""
+        self._link_after(self.tail.get_prev(), item)
+    
+    def insert(self, pos, item):
+        """Add a new item to the list at position pos."""
+        
+        if pos >= self._size:
+            self.append(item)
+        elif pos <= 0:
+            self.add(item)
+        else:
+            self._link_after(self._node_at(pos - 1), item)
+    
+    def get_first(self):
+        """Return the first item without removing it."""
+        
+        if self.is_empty():
+            raise IndexError('first item of empty list')
+        
+        return self.head.get_next().get_data()
+    
+    def get_last(self):
+        """Return the last item without removing it."""
+        
+        if self.is_empty():
+            raise IndexError('last item of empty list')
+        
+        return self.tail.get_prev().get_data()
+    
+    def pop(self, pos=None):
+        """Remove and return the item at position pos. If pos=None, remove and
+        return the last item. Both ends take O(1) time.
+        """
+        
+        if self.is_empty():
+            raise IndexError('pop from empty list')
+        
+        if pos is None:
+            pos = self._size - 1
+        
+        elif pos < 0:
+            pos += self._size
+        
+        if not 0 <= pos < self._size:
+            raise IndexError('pop index out of range')
+        
+        return self._unlink(self._node_at(pos))
+    
+    def search(self, item):
+        """Search for the item in the list and returns a boolean value."""
+        
+        current = self.head.get_next()
+        
+        while current is not self.tail:
+            if current.get_data() == item:
+                return True
+            current = current.get_next()
+        
+        return False
+    
+    def remove(self, item):
+        """Remove the item from the list. Do nothing if the item is not
+        in the list.
+        """
+        
+        current = self.head.get_next()
+        
+        while current is not self.tail:
+            if current.get_data() == item:
+                self._unlink(current)
+                return
+            current = current.get_next()
+    
+    def index(self, item):
+        """Return the position of the item in the list."""
+        
+        pos = 0
+        current = self.head.get_next()
+        
+        while current is not self.tail:
+            if current.get_data() == item:
+                return pos
+            current = current.get_next()
+            pos += 1
+        
+        raise ValueError('{} is not in list'.format(item))
@@ -0,0 +1,239 @@
+import random
+
+
+# Probability that a node reaching level i also reaches level i + 1
+P = 0.25
+
+MAX_LEVEL = 32
+
+
+class SkipNode:
+    """Node of a skip list, with a forward link and a span on each level.
+    
+    span[i] is the number of positions between the node and next[i], which
+    lets positions be counted without walking the bottom level.
+    """
+    
+    __slots__ = ('data', 'next', 'span')
+    
+    def __init__(self, data, level):
+        self.data = data
+        self.next = [None] * level
+        self.span = [0] * level
+
+
+class SkipList:
+    """Implementation of the ordered list abstract data type with a skip list.
+    
+    Every node is on the bottom level, and on each level above with
+    probability P, so searches can skip ahead on the sparse upper levels and
+    add, search, remove, index and pop take O(log n) expected time instead of
+    O(n). Has the same methods as OrderedList, plus range_() iteration.
+    """
+    
+    def __init__(self, iterable=None, seed=None):
+        """
+        Parameters
+        ----------
+        iterable : iterable, default: None
+            Items to add.
+        
+        seed : int, default: None
+            Seed for the random node levels, for reproducible structure.
+        """
+        
+        self.head = SkipNode(None, MAX_LEVEL)
+        self.level = 1
+        self._size = 0
+        self._rng = random.Random(seed)
+        
+        if iterable is not None:
+            self.extend(iterable)
+    
+    @classmethod
+    def from_iterable(cls, iterable):
+        """Create a list holding the items of an iterable."""
+        return cls(iterable)
+    
+    def is_empty(self):
+        return self._size == 0
+    
+    def length(self):
+        return self._size
+    
+    def __len__(self):
+        return self._size
+    
+    def __iter__(self):
+        current = self.head.next[0]
+        while current is not None:
+            yield current.data
+            current = current.next[0]
+    
+    def __str__(self):
+        return '[{}]'.format(', '.join(str(data) for data in self))
+    
+    def _random_level(self):
+        level = 1
+        while level < MAX_LEVEL and self._rng.random() < P:
+            level += 1
+        return level
+    
+    def _find(self, item, strict=True):
+        """Return the last node before item on every level, and their
+        positions (the head being at position 0).
+        
+        With strict=False, nodes equal to item count as before it.
+        """
+        
+        update = [self.head] * self.level
+        rank = [0] * self.level
+        current, position = self.head, 0
+        
+        for i in range(self.level - 1, -1, -1):
+            following = current.next[i]
+            # Separate loops keep the strict test out of the hot path
+            if strict:
+                while following is not None and following.data < item:
+                    position += current.span[i]
+                    current = following
+                    following = current.next[i]
+            else:
+                while following is not None and not item < following.data:
+                    position += current.span[i]
+                    current = following
+                    following = current.next[i]
+            update[i] = current
+            rank[i] = position
+        
+        return update, rank
+    
+    def _find_position(self, pos):
+        """Return the last node before position pos on every level."""
+        
+        update = [self.head] * self.level
+        current, position = self.head, 0
+        
+        for i in range(self.level - 1, -1, -1):
+            while current.next[i] is not None and position + current.span[i] <= pos:
+                position += current.span[i]
+                current = current.next[i]
+            update[i] = current
+        
+        return update
+    
+    def _delete(self, node, update):
+        """Unlink node, given the last node before it on every level."""
+        
+        for i in range(self.level):
+            if update[i].next[i] is node:
+                update[i].span[i] += node.span[i] - 1
+                update[i].next[i] = node.next[i]
+            else:
+                update[i].span[i] -= 1
+        
+        while self.level > 1 and self.head.next[self.level - 1] is None:
+            self.level -= 1
+        self._size -= 1
+    
+    def add(self, item):
+        """Add a new item to the list making sure that the order is preserved."""
+        
+        # Equal items go after existing ones, like OrderedList
+        update, rank = self._find(item, strict=False)
+        position = rank[0] + 1
+        
+        level = self._random_level()
+        for i in range(self.level, level):
+            update.append(self.head)
+            rank.append(0)
+            self.head.span[i] = self._size
+        self.level = max(self.level, level)
+        
+        n = SkipNode(item, level)
+        for i in range(level):
+            previous = update[i]
+            n.next[i] = previous.next[i]
+            previous.next[i] = n
+            # Split the span of the previous node at the new one
+            n.span[i] = previous.span[i] - (position - 1 - rank[i])
+            previous.span[i] = position - rank[i]
+        
+        # Links above the new node now jump over one more position
+        for i in range(level, self.level):
+            update[i].span[i] += 1
+        
+        self._size += 1
+    
+    def extend(self, iterable):
+        """Add the items of an iterable."""
+        for item in iterable:
+            self.add(item)
+    
+    def search(self, item):
+        """Search for the item in the list."""
+        
+        update, _ = self._find(item)
+        following = update[0].next[0]
+        return following is not None and following.data == item
+    
+    __contains__ = search
+    
+    def remove(self, item):
+        """Remove the item from the list. Do nothing if the item is not
+        in the list.
+        """
+        
+        update, _ = self._find(item)
+        following = update[0].next[0]
+        if following is not None and following.data == item:
+            self._delete(following, update)
+    
+    def index(self, item):
+        """Return the position of the item in the list."""
+        
+        update, rank = self._find(item)
+        following = update[0].next[0]
+        if following is not None and following.data == item:
+            return rank[0]
+        
+        raise ValueError('{} is not in list'.format(item))
+    
+    def pop(self, pos=None):
+        """Remove and return the item at position pos. If pos=None, remove and
+        return the last item.
+        """
+        
+        if self.is_empty():
+            raise IndexError('pop from empty list')
+        
+        if pos is None:
+            pos = self._size - 1
+        
+        elif pos < 0:
+            pos += self._size
+        
+        if not 0 <= pos < self._size:
+            raise IndexError('pop index out of range')
+        
+        update = self._find_position(pos)
+        node = update[0].next[0]
+        self._delete(node, update)
+        
+        return node.data
+    
+    def range_(self, low=None, high=None):
+        """Yield the items from low up to but not including high, in order.
+        
+        None leaves that end of the range open.
+        """
+        
+        if low is None:
+            current = self.head.next[0]
+        else:
+            update, _ = self._find(low)
+            current = update[0].next[0]
+        
+        while current is not None and (high is None or current.data < high):
+            yield current.data
+            current = current.next[0]